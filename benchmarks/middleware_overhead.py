@@ -0,0 +1,102 @@
+"""
+Measure per-request middleware overhead for API routes
+
+Compares the stock Django middleware stack with the path-scoped stack in
+root/settings.py using a trivial JSON view, so the numbers reflect
+middleware cost only (no database, no DRF).
+
+Usage:
+    python benchmarks/middleware_overhead.py [--requests 20000]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'root.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.base import BaseHandler  # noqa: E402
+from django.http import JsonResponse  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.urls import path  # noqa: E402
+
+STOCK_MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+def ping(request):
+    return JsonResponse({'status': 'ok'})
+
+
+urlpatterns = [
+    path('api/ping/', ping),
+]
+
+
+def build_handler(middleware):
+    with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF=__name__):
+        handler = BaseHandler()
+        handler.load_middleware()
+    return handler
+
+
+def measure(handler, make_request, count):
+    with override_settings(ROOT_URLCONF=__name__):
+        for _ in range(min(count, 500)):
+            handler.get_response(make_request())
+        # Build requests up front so only the handler is timed
+        requests = [make_request() for _ in range(count)]
+        start = time.perf_counter()
+        for request in requests:
+            handler.get_response(request)
+        elapsed = time.perf_counter() - start
+    return elapsed / count * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    factory = RequestFactory(HTTP_HOST='localhost')
+    scenarios = {
+        'GET /api/ping/': lambda: factory.get('/api/ping/'),
+        'OPTIONS preflight': lambda: factory.options(
+            '/api/ping/',
+            HTTP_ORIGIN='http://localhost:3000',
+            HTTP_ACCESS_CONTROL_REQUEST_METHOD='GET',
+        ),
+    }
+    profiles = {
+        'stock': STOCK_MIDDLEWARE,
+        'fast path': settings.MIDDLEWARE,
+    }
+
+    handlers = {name: build_handler(middleware) for name, middleware in profiles.items()}
+    print(f'{"scenario":<20} {"profile":<10} {"us/request":>12}')
+    for scenario, make_request in scenarios.items():
+        baseline = None
+        for name, handler in handlers.items():
+            cost = measure(handler, make_request, args.requests)
+            delta = '' if baseline is None else f' ({(cost - baseline) / baseline:+.0%})'
+            baseline = baseline or cost
+            print(f'{scenario:<20} {name:<10} {cost:>12.1f}{delta}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare worker startup cost of the full and the API-only deployment profiles
+
+Each profile is started in a fresh interpreter with ``python -X importtime``:
+the WSGI module is imported and warmed up (root/warmup.py, as a preloading
+master would do), then the import time, wall time, module count and
+resident memory are reported. Import time is also broken down by
+top-level package, which shows what the lean profile leaves out.
+
+Usage:
+    python benchmarks/startup_profile.py [--runs 5] [--top 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    'full': ('root.settings', 'root.wsgi'),
+    'api': ('root.settings_api', 'root.wsgi_api'),
+}
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {wsgi}
+from root.warmup import warm_up
+warm_up()
+elapsed = time.perf_counter() - started
+rss_kb = None
+try:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'wall_s': elapsed, 'rss_kb': rss_kb, 'modules': len(sys.modules)}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Return total import time and self time per top-level package, in microseconds"""
+    total = 0
+    by_package = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not name[1:].startswith(' '):
+            total += int(cumulative_us)
+        by_package[name.strip().split('.')[0]] += int(self_us)
+    return total, by_package
+
+
+def run_profile(settings_module, wsgi_module):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD.format(wsgi=wsgi_module)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample['import_us'], sample['by_package'] = parse_importtime(result.stderr)
+    return sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='packages to list per profile')
+    args = parser.parse_args()
+
+    print(f'{"profile":<8} {"import ms":>10} {"wall ms":>9} {"RSS MB":>8} {"modules":>8}')
+    breakdowns = {}
+    for name, (settings_module, wsgi_module) in PROFILES.items():
+        samples = [run_profile(settings_module, wsgi_module) for _ in range(args.runs)]
+        import_ms = statistics.median(sample['import_us'] for sample in samples) / 1000
+        wall_ms = statistics.median(sample['wall_s'] for sample in samples) * 1000
+        rss_mb = statistics.median(sample['rss_kb'] for sample in samples) / 1024
+        modules = samples[-1]['modules']
+        print(f'{name:<8} {import_ms:>10.1f} {wall_ms:>9.1f} {rss_mb:>8.1f} {modules:>8}')
+        breakdowns[name] = samples[-1]['by_package']
+
+    for name, by_package in breakdowns.items():
+        print(f'\n{name}: import self time by package (ms, last run)')
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+            print(f'  {package:<24} {self_us / 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from .models import AuditEvent
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = ['occurred_at', 'action', 'resource', 'object_id', 'actor_username', 'ip_address']
+    list_filter = ['action', 'resource']
+    search_fields = ['actor_username']
+    date_hierarchy = 'occurred_at'
+
+    # The audit log is append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core.audit'
+    label = 'core_audit'
+    verbose_name = 'Audit Log'
+
+    def ready(self):
+        from .signals import connect_signals  # pylint: disable=import-outside-toplevel
+        connect_signals()
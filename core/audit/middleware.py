@@ -0,0 +1,25 @@
+from contextvars import ContextVar
+
+_current_request = ContextVar('audit_request', default=None)
+
+
+def current_request():
+    """Return the request being handled in this context, or None"""
+    return _current_request.get()
+
+
+class AuditContextMiddleware:
+    """
+    Make the current request available to audit signal handlers, so model
+    saves can be attributed to the signed-in user and client address
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
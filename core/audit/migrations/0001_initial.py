@@ -0,0 +1,36 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:16
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted'), ('signin', 'Signed in'), ('signin_failed', 'Sign in failed'), ('signout', 'Signed out'), ('password_changed', 'Password changed')], max_length=20)),
+                ('resource', models.CharField(blank=True, max_length=20)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('actor_id', models.BigIntegerField(blank=True, null=True)),
+                ('actor_username', models.CharField(blank=True, max_length=150)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('changes', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+            ],
+            options={
+                'verbose_name': 'Audit event',
+                'verbose_name_plural': 'Audit events',
+                'ordering': ['-occurred_at', '-id'],
+                'indexes': [models.Index(fields=['occurred_at'], name='audit_occurred_idx'), models.Index(fields=['resource', 'object_id', 'occurred_at'], name='audit_object_idx'), models.Index(fields=['actor_id', 'occurred_at'], name='audit_actor_idx'), models.Index(fields=['action', 'occurred_at'], name='audit_action_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEvent(models.Model):
+    """
+    Append-only record of a role change or authentication event
+    Written in batches by core/audit/writer.py; ``changes`` maps each
+    changed field to ``[old, new]``
+    """
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+        ('signin', 'Signed in'),
+        ('signin_failed', 'Sign in failed'),
+        ('signout', 'Signed out'),
+        ('password_changed', 'Password changed'),
+    ]
+
+    occurred_at = models.DateTimeField(default=timezone.now)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    resource = models.CharField(max_length=20, blank=True)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    # Plain columns rather than a foreign key, so events outlive their users
+    actor_id = models.BigIntegerField(null=True, blank=True)
+    actor_username = models.CharField(max_length=150, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    changes = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        target = f" {self.resource} #{self.object_id}" if self.resource else ''
+        return f"{self.action}{target} by {self.actor_username or 'anonymous'} at {self.occurred_at}"
+
+    class Meta:
+        verbose_name = 'Audit event'
+        verbose_name_plural = 'Audit events'
+        ordering = ['-occurred_at', '-id']
+        indexes = [
+            models.Index(fields=['occurred_at'], name='audit_occurred_idx'),
+            models.Index(fields=['resource', 'object_id', 'occurred_at'], name='audit_object_idx'),
+            models.Index(fields=['actor_id', 'occurred_at'], name='audit_actor_idx'),
+            models.Index(fields=['action', 'occurred_at'], name='audit_action_idx'),
+        ]
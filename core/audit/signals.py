@@ -0,0 +1,86 @@
+"""
+Capture field-level changes of Students, Parents and Instructors and
+authentication events for the audit log
+
+Each loaded instance keeps a snapshot of its field values (``post_init``);
+``post_save`` compares against it and queues the changed fields once the
+transaction commits. Set-based ``update()`` calls bypass model signals and
+are not diffed here: term-end promotion and archiving (core/user/term_end.py)
+record one event per chunk themselves, with the affected ids under
+``object_ids``. ``updated_at`` bumps after a user's name or email changes
+touch only ignored bookkeeping columns.
+"""
+from functools import partial
+
+from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from core.user.models import Instructor, Parent, Student, UserProfile
+from core.user.signals import sync_resource_for
+
+from .writer import record_event
+
+AUDITED_MODELS = (Student, Parent, UserProfile, Instructor)
+
+# Bookkeeping columns that change on every save
+IGNORED_FIELDS = {'created_at', 'updated_at'}
+
+
+def field_values(instance):
+    """Return the audited, loaded field values of an instance"""
+    deferred = instance.get_deferred_fields()
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.name not in IGNORED_FIELDS and field.attname not in deferred
+    }
+
+
+def take_snapshot(sender, instance, **kwargs):
+    instance._audit_snapshot = field_values(instance)  # pylint: disable=protected-access
+
+
+def audit_save(sender, instance, created, **kwargs):
+    current = field_values(instance)
+    if created:
+        changes = {name: [None, value] for name, value in current.items()}
+    else:
+        before = getattr(instance, '_audit_snapshot', {})
+        changes = {
+            name: [before[name], value]
+            for name, value in current.items()
+            if name in before and before[name] != value
+        }
+    instance._audit_snapshot = current  # pylint: disable=protected-access
+    if changes:
+        transaction.on_commit(partial(
+            record_event, 'created' if created else 'updated', sync_resource_for(sender), instance.pk, changes,
+        ))
+
+
+def audit_delete(sender, instance, **kwargs):
+    transaction.on_commit(partial(record_event, 'deleted', sync_resource_for(sender), instance.pk))
+
+
+def audit_signin(sender, request, user, **kwargs):
+    record_event('signin', actor=user, request=request)
+
+
+def audit_signin_failed(sender, credentials, request=None, **kwargs):
+    # Django masks sensitive credential values before sending the signal
+    record_event('signin_failed', changes={'username': credentials.get('username')}, request=request)
+
+
+def audit_signout(sender, request, user, **kwargs):
+    record_event('signout', actor=user, request=request)
+
+
+def connect_signals():
+    for model in AUDITED_MODELS:
+        post_init.connect(take_snapshot, sender=model, dispatch_uid=f'audit.take_snapshot.{model.__name__}')
+        post_save.connect(audit_save, sender=model, dispatch_uid=f'audit.audit_save.{model.__name__}')
+        post_delete.connect(audit_delete, sender=model, dispatch_uid=f'audit.audit_delete.{model.__name__}')
+    user_logged_in.connect(audit_signin, dispatch_uid='audit.signin')
+    user_login_failed.connect(audit_signin_failed, dispatch_uid='audit.signin_failed')
+    user_logged_out.connect(audit_signout, dispatch_uid='audit.signout')
@@ -0,0 +1,6 @@
+from django.urls import path
+from core.audit import views
+
+urlpatterns = [
+    path('events/', views.audit_events, name='audit_events'),
+]
@@ -0,0 +1,67 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+
+from core.user.listing import ListParamError, paginate
+
+from .models import AuditEvent
+
+AUDIT_FIELDS = (
+    'id', 'occurred_at', 'action', 'resource', 'object_id',
+    'actor_id', 'actor_username', 'ip_address', 'changes',
+)
+
+# Exact-match query parameters and the columns they filter
+AUDIT_FILTERS = {
+    'action': 'action',
+    'resource': 'resource',
+    'object_id': 'object_id',
+    'actor': 'actor_id',
+}
+
+
+def _time_param(params, name):
+    raw = params.get(name)
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        raise ListParamError(f'{name} must be an ISO 8601 datetime')
+    return value
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def audit_events(request):
+    """
+    Get audit events, newest first
+    Filter with ?since= / ?until= (ISO 8601), ?action=, ?resource=,
+    ?object_id= and ?actor= (user id); page with ?page= and ?page_size=.
+    Events reach the table within AUDIT_LOG['FLUSH_INTERVAL'] seconds.
+    """
+    params = request.query_params
+    queryset = AuditEvent.objects.all()
+    try:
+        since = _time_param(params, 'since')
+        until = _time_param(params, 'until')
+        if since:
+            queryset = queryset.filter(occurred_at__gte=since)
+        if until:
+            queryset = queryset.filter(occurred_at__lt=until)
+        for param, column in AUDIT_FILTERS.items():
+            if params.get(param):
+                queryset = queryset.filter(**{column: params[param]})
+        rows, pagination = paginate(queryset.values(*AUDIT_FIELDS), params)
+        events = list(rows)
+    except (ListParamError, ValueError) as exc:
+        return Response({
+            'error': str(exc)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'events': events,
+        'count': len(events),
+        'pagination': pagination
+    }, status=status.HTTP_200_OK)
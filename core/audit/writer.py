@@ -0,0 +1,180 @@
+"""
+Buffered, batched writer for audit events
+
+``record_event`` only appends a dict to an in-memory buffer; a background
+thread turns the buffer into AuditEvent rows with ``bulk_create`` every
+FLUSH_INTERVAL seconds or as soon as BATCH_SIZE events are waiting, so
+audited requests do not pay for an extra INSERT. The buffer holds at most
+BUFFER_SIZE events: when the database cannot keep up, new events are
+dropped and counted (``audit.dropped`` at /api/metrics/) rather than
+growing memory. A batch that fails because the database is unreachable is
+put back at the head of the buffer, within BUFFER_SIZE, and retried on the
+next flush. Pending events are flushed when the process exits.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, close_old_connections, connections
+from django.utils import timezone
+
+from core.middleware.metrics import metrics
+
+from .middleware import current_request
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Bounded event buffer drained by one daemon thread"""
+
+    def __init__(self, config):
+        self.config = config
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def record(self, event):
+        with self._condition:
+            if len(self._buffer) >= self.config['BUFFER_SIZE']:
+                metrics.incr('audit.dropped')
+                return
+            self._buffer.append(event)
+            if self._thread is None:
+                self._start()
+            if len(self._buffer) >= self.config['BATCH_SIZE']:
+                self._condition.notify()
+        metrics.incr('audit.recorded')
+
+    def _start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._stopping or len(self._buffer) >= self.config['BATCH_SIZE'],
+                        self.config['FLUSH_INTERVAL'],
+                    )
+                    if self._stopping:
+                        return
+                # Drop connections that broke or outlived CONN_MAX_AGE, as
+                # the request cycle does for request threads
+                close_old_connections()
+                self.flush()
+        finally:
+            connections.close_all()
+
+    def _take(self):
+        with self._condition:
+            count = min(len(self._buffer), self.config['BATCH_SIZE'])
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _requeue(self, events):
+        """Put events back at the head of the buffer, dropping what no longer fits"""
+        with self._condition:
+            kept = events[:max(self.config['BUFFER_SIZE'] - len(self._buffer), 0)]
+            self._buffer.extendleft(reversed(kept))
+        if len(kept) < len(events):
+            metrics.incr('audit.dropped', len(events) - len(kept))
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of events written"""
+        AuditEvent = apps.get_model('core_audit', 'AuditEvent')  # pylint: disable=invalid-name
+        written = 0
+        while True:
+            events = self._take()
+            if not events:
+                return written
+            started = time.perf_counter()
+            try:
+                AuditEvent.objects.bulk_create([AuditEvent(**event) for event in events])
+            except (OperationalError, InterfaceError):
+                # Connection trouble: keep the events and retry on the next flush
+                logger.exception('Could not write %d audit events, will retry', len(events))
+                metrics.incr('audit.write_errors', len(events))
+                self._requeue(events)
+                return written
+            except DatabaseError:
+                # The events themselves were rejected; retrying cannot help
+                logger.exception('Could not write %d audit events', len(events))
+                metrics.incr('audit.write_errors', len(events))
+                continue
+            metrics.observe('audit.flush_seconds', time.perf_counter() - started)
+            metrics.incr('audit.written', len(events))
+            written += len(events)
+
+    def shutdown(self, timeout=5):
+        """Stop the background thread and write whatever is still buffered"""
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def _after_fork(self):
+        # The writer thread does not exist in the child and the parent
+        # writes its own buffered events
+        self._condition = threading.Condition()
+        self._buffer.clear()
+        self._thread = None
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer  # pylint: disable=global-statement
+    with _writer_lock:
+        if _writer is None:
+            _writer = AuditWriter(settings.AUDIT_LOG)
+            atexit.register(_writer.shutdown)
+        return _writer
+
+
+def _client_ip(request):
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def record_event(action, resource='', object_id=None, changes=None, actor=None, request=None):
+    """
+    Queue an audit event
+    ``actor`` and ``request`` default to the user and request being handled.
+    """
+    if not settings.AUDIT_LOG['ENABLED']:
+        return
+    request = request if request is not None else current_request()
+    if actor is None and request is not None:
+        actor = getattr(request, 'user', None)
+    authenticated = actor is not None and actor.is_authenticated
+    get_writer().record({
+        'occurred_at': timezone.now(),
+        'action': action,
+        'resource': resource,
+        'object_id': object_id,
+        'actor_id': actor.pk if authenticated else None,
+        'actor_username': actor.get_username() if authenticated else '',
+        'ip_address': _client_ip(request) if request is not None else None,
+        'changes': changes,
+    })
+
+
+def _reset_after_fork():
+    if _writer is not None:
+        _writer._after_fork()  # pylint: disable=protected-access
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -5,9 +5,28 @@ from rest_framework import status
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from core.audit.writer import record_event
+from core.user.models import Instructor, Parent, Student
 
 User = get_user_model()  # pylint: disable=invalid-name
 
+# Profiles signup can create alongside the user; student and instructor ids
+# are allocated automatically
+SIGNUP_ROLES = {
+    'student': (Student, 'student_id'),
+    'parent': (Parent, None),
+    'instructor': (Instructor, 'employee_id'),
+}
+
+# Roles only staff may sign users up for; self-service signup cannot pick them
+STAFF_ROLES = {'instructor'}
+
+
+def _signup_roles(user):
+    return [role for role in SIGNUP_ROLES if role not in STAFF_ROLES or user.is_staff]
+
 
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
@@ -57,7 +76,9 @@ def signup(request):
     if request.method == 'GET':
         return Response({
             'message': 'Sign up endpoint',
-            'required_fields': ['username', 'email', 'password']
+            'required_fields': ['username', 'email', 'password'],
+            'optional_fields': ['first_name', 'last_name', 'role'],
+            'roles': _signup_roles(request.user)
         })
     
     username = request.data.get('username')
@@ -65,12 +86,23 @@ def signup(request):
     password = request.data.get('password')
     first_name = request.data.get('first_name', '')
     last_name = request.data.get('last_name', '')
+    role = request.data.get('role')
     
     if not username or not email or not password:
         return Response({
             'error': 'Username, email, and password are required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    if role and (not isinstance(role, str) or role not in SIGNUP_ROLES):
+        return Response({
+            'error': f"Invalid role. Choose from: {', '.join(_signup_roles(request.user))}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if role in STAFF_ROLES and not request.user.is_staff:
+        return Response({
+            'error': f'Only staff can create {role} accounts'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
     if User.objects.filter(username=username).exists():
         return Response({
             'error': 'Username already exists'
@@ -81,23 +113,35 @@ def signup(request):
             'error': 'Email already exists'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    user = User.objects.create(
-        username=username,
-        email=email,
-        password=make_password(password),
-        first_name=first_name,
-        last_name=last_name
-    )
+    with transaction.atomic():
+        user = User.objects.create(
+            username=username,
+            email=email,
+            password=make_password(password),
+            first_name=first_name,
+            last_name=last_name
+        )
+        profile = None
+        if role:
+            model, _ = SIGNUP_ROLES[role]
+            profile = model.objects.create(user=user)
+    
+    data = {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name
+    }
+    if role:
+        data['role'] = role
+        id_field = SIGNUP_ROLES[role][1]
+        if id_field:
+            data[id_field] = getattr(profile, id_field)
     
     return Response({
         'message': 'User created successfully',
-        'user': {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name
-        }
+        'user': data
     }, status=status.HTTP_201_CREATED)
 
 
@@ -156,6 +200,8 @@ def change_password(request):
     
     user.set_password(new_password)
     user.save()
+    # No Django signal covers password changes, so record it explicitly
+    record_event('password_changed', actor=user, request=request)
     
     return Response({
         'message': 'Password changed successfully'
@@ -0,0 +1,185 @@
+"""
+Admission control and load shedding for API requests
+
+Each request under API_PATH_PREFIX belongs to a route class (auth, read or
+write). A class admits at most ``limit`` concurrent requests; the rest wait
+in a bounded queue until a slot frees up or their queue-time budget runs
+out, and are then shed with ``503`` + ``Retry-After``. The limit adapts
+with AIMD: it grows by about one per window of fast responses while the
+class is saturated, and is cut by BACKOFF when responses exceed the
+class's TARGET_LATENCY_MS.
+
+The middleware sits in front of the session and auth middleware, so shed
+requests never touch the database. Batch requests (BATCH_PATHS) are not
+admitted as a whole: root/batch.py admits each sub-request in its own class
+through ``request.admission``.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+
+from .metrics import metrics
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class AdaptiveLimiter:
+    """Concurrency limit for one route class, adjusted by AIMD"""
+
+    def __init__(self, name, config):
+        self.name = name
+        self.min_limit = config['MIN_LIMIT']
+        self.max_limit = config['MAX_LIMIT']
+        self.target = config['TARGET_LATENCY_MS'] / 1000
+        self.queue_timeout = config['QUEUE_TIMEOUT_MS'] / 1000
+        self.max_queue = config['MAX_QUEUE']
+        self.backoff = config.get('BACKOFF', 0.9)
+        self.limit = float(config['INITIAL_LIMIT'])
+        self.in_flight = 0
+        self.waiting = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def _has_slot(self):
+        return self.in_flight < int(self.limit)
+
+    def acquire(self, budget):
+        """
+        Wait up to ``budget`` seconds for a slot
+        Returns None when admitted, otherwise the reason for shedding.
+        """
+        with self._condition:
+            if self._has_slot() and not self.waiting:
+                self.in_flight += 1
+                return None
+            if self.waiting >= self.max_queue:
+                return 'queue_full'
+            timeout = min(self.queue_timeout, budget)
+            if timeout <= 0:
+                return 'deadline'
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(self._has_slot, timeout)
+            finally:
+                self.waiting -= 1
+            if not admitted:
+                return 'queue_timeout'
+            self.in_flight += 1
+            return None
+
+    def release(self, latency):
+        with self._condition:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            now = time.monotonic()
+            if latency > self.target:
+                # One decrease per target interval, so a burst of slow
+                # responses finishing together does not collapse the limit
+                if now - self._last_decrease >= self.target:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify()
+            metrics.gauge(f'admission.{self.name}.limit', round(self.limit, 2))
+
+
+def upstream_queue_time(value, now=None):
+    """
+    Seconds a request spent queued before reaching Django, from an
+    X-Request-Start header (``t=<seconds|milliseconds|microseconds>``), or None
+    """
+    if not value:
+        return None
+    try:
+        started = float(value.strip().removeprefix('t='))
+    except ValueError:
+        return None
+    # Proxies send seconds, milliseconds or microseconds since the epoch
+    while started > 1e11:
+        started /= 1000
+    queued = (now if now is not None else time.time()) - started
+    return queued if queued >= 0 else None
+
+
+class AdmissionControlMiddleware:
+    """
+    Admit, queue or shed API requests per route class (see module docstring)
+
+    Requests waiting upstream (X-Request-Start) longer than MAX_QUEUE_MS are
+    shed immediately, and the time they already waited counts against the
+    class queue timeout. Admitted and shed counts, queue waits and current
+    limits are published to /api/metrics/.
+    """
+
+    def __init__(self, get_response):
+        self.config = settings.ADMISSION_CONTROL
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.limiters = {
+            name: AdaptiveLimiter(name, config) for name, config in self.config['CLASSES'].items()
+        }
+
+    def route_class(self, request):
+        """Return the route class of a request, or None if it is not limited"""
+        path = request.path_info
+        if not path.startswith(settings.API_PATH_PREFIX) or path in self.config['EXEMPT_PATHS']:
+            return None
+        if path in self.config['BATCH_PATHS']:
+            return None
+        if path.startswith(self.config['AUTH_PATH_PREFIX']):
+            return 'auth'
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def __call__(self, request):
+        request.admission = self
+        with self.admit(request) as shed:
+            return shed or self.get_response(request)
+
+    @contextmanager
+    def admit(self, request):
+        """
+        Hold a slot of the request's route class while the block runs
+        Yields None when admitted (or not limited), else the 503 response.
+        """
+        name = self.route_class(request)
+        if name is None:
+            yield None
+            return
+        limiter = self.limiters[name]
+
+        budget = self.config['MAX_QUEUE_MS'] / 1000
+        queued = upstream_queue_time(request.META.get('HTTP_X_REQUEST_START'))
+        if queued is not None:
+            budget -= queued
+        if budget <= 0:
+            yield self._shed(name, 'deadline')
+            return
+
+        waiting_since = time.monotonic()
+        reason = limiter.acquire(budget)
+        if reason:
+            yield self._shed(name, reason)
+            return
+        started = time.monotonic()
+        metrics.incr(f'admission.{name}.admitted')
+        metrics.observe(f'admission.{name}.queue_seconds', started - waiting_since)
+        try:
+            yield None
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    def _shed(self, name, reason):
+        metrics.incr(f'admission.{name}.shed')
+        metrics.incr(f'admission.{name}.shed.{reason}')
+        response = JsonResponse(
+            {'error': 'Server is busy, please retry shortly'},
+            status=503,
+        )
+        response.headers['Retry-After'] = str(self.config['RETRY_AFTER'])
+        return response
@@ -0,0 +1,228 @@
+import gzip
+import hashlib
+import re
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+from .metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+ACCEPT_ENCODING = re.compile(r'\s*([\w*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+# Already-compressed media (e.g. avatars) would only cost CPU to recompress
+INCOMPRESSIBLE_TYPES = ('image/', 'audio/', 'video/')
+
+
+class GzipCodec:
+    name = 'gzip'
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=6, mtime=0)
+
+    def stream(self):
+        return _FlushingStream(zlib.compressobj(6, zlib.DEFLATED, 31), zlib.Z_SYNC_FLUSH)
+
+
+class BrotliCodec:
+    name = 'br'
+
+    def compress(self, data):
+        return brotli.compress(data, quality=5)
+
+    def stream(self):
+        return _BrotliStream(brotli.Compressor(quality=5))
+
+
+class ZstdCodec:
+    name = 'zstd'
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def stream(self):
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        return _FlushingStream(compressor, zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+class _FlushingStream:
+    """
+    Adapt a zlib-style compressobj (also used by zstandard) to compress/finish
+    Each chunk is flushed so streamed data reaches the client without delay
+    """
+
+    def __init__(self, compressor, flush_mode):
+        self.compressor = compressor
+        self.flush_mode = flush_mode
+
+    def compress(self, chunk):
+        return self.compressor.compress(chunk) + self.compressor.flush(self.flush_mode)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, compressor):
+        self.compressor = compressor
+
+    def compress(self, chunk):
+        return self.compressor.process(chunk) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+CODECS = {'gzip': GzipCodec()}
+if brotli is not None:
+    CODECS['br'] = BrotliCodec()
+if zstandard is not None:
+    CODECS['zstd'] = ZstdCodec()
+
+
+def negotiate(accept_encoding, preferences):
+    """
+    Pick the best available encoding for an Accept-Encoding header
+    Ties in q-value are broken by the server preference order
+    """
+    accepted = {}
+    for match in ACCEPT_ENCODING.finditer(accept_encoding):
+        token, quality = match.group(1).lower(), match.group(2)
+        try:
+            accepted[token] = float(quality) if quality is not None else 1.0
+        except ValueError:
+            continue
+
+    best, best_quality = None, 0.0
+    for name in preferences:
+        if name not in CODECS:
+            continue
+        quality = accepted.get(name, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses with brotli, zstd or gzip
+
+    Responses under API_PATH_PREFIX larger than API_COMPRESSION['MIN_SIZE']
+    are compressed with the best encoding the client accepts. Streaming
+    responses are compressed chunk by chunk. Compressed bodies of at least
+    CACHE_MIN_SIZE bytes are cached by content digest, so a hot payload
+    (e.g. a cached list or the OpenAPI schema) is compressed once rather than
+    on every request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.API_COMPRESSION
+        self.cache = caches[self.config['CACHE_ALIAS']]
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path_info.startswith(settings.API_PATH_PREFIX):
+            return response
+        if response.has_header('Content-Encoding') or response.status_code < 200 or response.status_code == 206:
+            return response
+        if response.get('Content-Type', '').startswith(INCOMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.config['ENCODINGS'])
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = self._compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.config['MIN_SIZE']:
+                return response
+            compressed = self._compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compress(self, content, encoding):
+        cache_key = None
+        if len(content) >= self.config['CACHE_MIN_SIZE']:
+            digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+            cache_key = f'compressed:{encoding}:{digest}'
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                metrics.incr('compression.cache_hits')
+                self._record(encoding, len(content), len(cached))
+                return cached
+            metrics.incr('compression.cache_misses')
+
+        started = time.thread_time()
+        compressed = CODECS[encoding].compress(content)
+        metrics.observe(f'compression.{encoding}.cpu_seconds', time.thread_time() - started)
+        self._record(encoding, len(content), len(compressed))
+
+        if cache_key:
+            self.cache.set(cache_key, compressed, settings.CACHE_TTL)
+        return compressed
+
+    def _compress_stream(self, chunks, encoding):
+        stream = CODECS[encoding].stream()
+        size_in = size_out = 0
+        cpu = 0.0
+        for chunk in chunks:
+            started = time.thread_time()
+            out = stream.compress(chunk)
+            cpu += time.thread_time() - started
+            size_in += len(chunk)
+            size_out += len(out)
+            if out:
+                yield out
+        tail = stream.finish()
+        size_out += len(tail)
+        metrics.observe(f'compression.{encoding}.cpu_seconds', cpu)
+        self._record(encoding, size_in, size_out)
+        yield tail
+
+    async def _compress_async_stream(self, chunks, encoding):
+        stream = CODECS[encoding].stream()
+        size_in = size_out = 0
+        async for chunk in chunks:
+            out = stream.compress(chunk)
+            size_in += len(chunk)
+            size_out += len(out)
+            if out:
+                yield out
+        tail = stream.finish()
+        self._record(encoding, size_in, size_out + len(tail))
+        yield tail
+
+    @staticmethod
+    def _record(encoding, size_in, size_out):
+        metrics.incr(f'compression.{encoding}.responses')
+        metrics.incr(f'compression.{encoding}.bytes_in', size_in)
+        metrics.incr(f'compression.{encoding}.bytes_out', size_out)
+        if size_in:
+            metrics.observe(f'compression.{encoding}.ratio', size_out / size_in)
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.contrib.messages.middleware import MessageMiddleware as BaseMessageMiddleware
+from django.middleware.clickjacking import XFrameOptionsMiddleware as BaseXFrameOptionsMiddleware
+from django.middleware.common import CommonMiddleware as BaseCommonMiddleware
+
+
+def is_api_request(request):
+    """
+    Return True when the request targets the JSON API (API_PATH_PREFIX)
+    HTML pages served under the prefix (API_HTML_PATHS) are not API requests
+    """
+    path = request.path_info
+    if not path.startswith(settings.API_PATH_PREFIX):
+        return False
+    return not path.startswith(tuple(settings.API_HTML_PATHS))
+
+
+class BrowserOnlyMiddlewareMixin:
+    """
+    Skip the wrapped middleware for API requests
+
+    The subclasses below keep their place (and their class hierarchy, so
+    Django's system checks still recognise them) in MIDDLEWARE, but pass
+    ``/api/`` requests straight through to the next layer. Only middleware
+    that works purely via process_request/process_response can be scoped
+    this way; hooks such as process_view are still run by the handler.
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class CommonMiddleware(BrowserOnlyMiddlewareMixin, BaseCommonMiddleware):
+    """
+    CommonMiddleware for browser routes only
+    APPEND_SLASH/PREPEND_WWW are disabled for the API
+    """
+
+
+class MessageMiddleware(BrowserOnlyMiddlewareMixin, BaseMessageMiddleware):
+    """
+    MessageMiddleware for browser routes only
+    The JSON API never renders flash messages
+    """
+
+
+class XFrameOptionsMiddleware(BrowserOnlyMiddlewareMixin, BaseXFrameOptionsMiddleware):
+    """
+    XFrameOptionsMiddleware for browser routes only
+    JSON responses cannot be framed, so the header is only needed for HTML
+    """
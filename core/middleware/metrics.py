@@ -0,0 +1,51 @@
+"""
+In-process counters and timings for the API middleware
+
+Values are per worker process and reset on restart; they are exposed to
+staff at /api/metrics/.
+"""
+import threading
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and summary observations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._observations = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """Record the current value of something (e.g. a concurrency limit)"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, value):
+        """Record a sample (e.g. a duration); keeps count, sum and max"""
+        with self._lock:
+            summary = self._observations.setdefault(name, {'count': 0, 'sum': 0.0, 'max': 0.0})
+            summary['count'] += 1
+            summary['sum'] += value
+            summary['max'] = max(summary['max'], value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'observations': {name: dict(summary) for name, summary in self._observations.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+metrics = Metrics()
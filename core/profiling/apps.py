@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ProfilingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core.profiling'
+    label = 'core_profiling'
+    verbose_name = 'Request Profiling'
@@ -0,0 +1,179 @@
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import random
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .storage import save_profile
+
+logger = logging.getLogger(__name__)
+
+
+REDACTED = '[redacted]'
+
+WRITE = re.compile(r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+class SensitiveSql:
+    """
+    Tells whether a statement's parameters may hold secrets
+    ``columns`` maps tables to their sensitive columns (PROFILING['REDACT_COLUMNS']).
+    Writes to those tables and statements naming one of their sensitive
+    columns count; plain joins, e.g. to auth_user for a username, do not.
+    """
+
+    def __init__(self, columns):
+        self.tables = {table.lower() for table in columns}
+        self.reads = [
+            (re.compile(rf'\b{re.escape(table)}\b', re.IGNORECASE),
+             re.compile(r'\b(?:%s)\b' % '|'.join(map(re.escape, names)), re.IGNORECASE))
+            for table, names in columns.items() if names
+        ]
+
+    def __call__(self, sql):
+        write = WRITE.match(sql)
+        if write and write.group(1).lower() in self.tables:
+            return True
+        return any(table.search(sql) and column.search(sql) for table, column in self.reads)
+
+
+class QueryRecorder:
+    """
+    Connection execute wrapper recording SQL text, parameters and duration
+    Parameters of sensitive statements (see SensitiveSql) are not recorded.
+    """
+
+    def __init__(self, alias, sensitive=None):
+        self.alias = alias
+        self.queries = []
+        self.sensitive = sensitive
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            redacted = self.sensitive is not None and self.sensitive(sql)
+            self.queries.append({
+                'alias': self.alias,
+                'sql': sql,
+                'params': REDACTED if redacted else (params if not many else None),
+                'duration_ms': (time.perf_counter() - started) * 1000,
+            })
+
+
+def explain(alias, sql, params):
+    """Return the database's plan for a SELECT, or None"""
+    # Plans can echo parameter values, so redacted statements are not explained
+    if params == REDACTED or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+    except Exception as exc:  # pylint: disable=broad-except
+        return f'EXPLAIN failed: {exc}'
+
+
+class ProfilingMiddleware:
+    """
+    Capture profiles of selected requests
+
+    A request is profiled with cProfile (plus its SQL) when it carries the
+    PROFILING['HEADER'] header from a staff user or with the shared TOKEN,
+    or when it is picked by SAMPLE_RATE. With SLOW_REQUEST_MS set, every
+    other request records only its SQL timings and is saved when it runs
+    over the threshold. Slow queries get their EXPLAIN output attached.
+
+    When PROFILING['ENABLED'] is false the middleware removes itself from
+    the stack at startup, so it costs nothing per request.
+    """
+
+    def __init__(self, get_response):
+        self.config = settings.PROFILING
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = 'HTTP_' + self.config['HEADER'].upper().replace('-', '_')
+        self.sensitive = SensitiveSql(self.config['REDACT_COLUMNS'])
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None and not self.config['SLOW_REQUEST_MS']:
+            return self.get_response(request)
+
+        recorders = [QueryRecorder(alias, self.sensitive) for alias in connections]
+        profiler = cProfile.Profile() if trigger else None
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for recorder in recorders:
+                stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+            if profiler:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler:
+                    profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if trigger is None:
+            if duration_ms < self.config['SLOW_REQUEST_MS']:
+                return response
+            trigger = 'slow'
+
+        try:
+            self._save(request, response, trigger, duration_ms, recorders, profiler)
+        except OSError:
+            logger.exception('Could not store profile for %s', request.path)
+        return response
+
+    def _trigger(self, request):
+        """Return why this request should be profiled, or None"""
+        if self.header in request.META:
+            token = self.config['TOKEN']
+            if token and hmac.compare_digest(request.META[self.header].encode(), token.encode()):
+                return 'token'
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_staff:
+                return 'header'
+        if self.config['SAMPLE_RATE'] and random.random() < self.config['SAMPLE_RATE']:
+            return 'sample'
+        return None
+
+    def _save(self, request, response, trigger, duration_ms, recorders, profiler):
+        queries = [query for recorder in recorders for query in recorder.queries]
+        for query in queries:
+            if query['duration_ms'] >= self.config['SLOW_QUERY_MS']:
+                query['explain'] = explain(query['alias'], query['sql'], query['params'])
+
+        stats = top_functions = None
+        if profiler:
+            stats = pstats.Stats(profiler)
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(30)
+            top_functions = output.getvalue()
+
+        user = getattr(request, 'user', None)
+        save_profile({
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'user': user.get_username() if user is not None and user.is_authenticated else None,
+            'trigger': trigger,
+            'started_at': time.time() - duration_ms / 1000,
+            'duration_ms': round(duration_ms, 2),
+            'query_count': len(queries),
+            'query_ms': round(sum(query['duration_ms'] for query in queries), 2),
+            'queries': queries,
+            'top_functions': top_functions,
+        }, stats)
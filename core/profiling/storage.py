@@ -0,0 +1,65 @@
+"""
+Bounded on-disk ring buffer of captured request profiles
+
+Each capture is a ``<id>.json`` summary (request, timings, SQL, EXPLAIN
+output, top functions) plus an optional ``<id>.prof`` pstats dump. Only the
+newest PROFILING['MAX_PROFILES'] captures are kept.
+"""
+import json
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+PROFILE_ID = re.compile(r'^\d{13}-[0-9a-f]{8}$')
+
+
+def profile_dir():
+    directory = Path(settings.PROFILING['DIRECTORY'])
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def new_profile_id():
+    """Time-ordered id, so sorting names sorts captures oldest first"""
+    return f'{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}'
+
+
+def save_profile(summary, stats=None):
+    """Write a capture and evict the oldest ones beyond MAX_PROFILES"""
+    directory = profile_dir()
+    profile_id = new_profile_id()
+    summary = {'id': profile_id, **summary, 'has_stats': stats is not None}
+    if stats is not None:
+        stats.dump_stats(str(directory / f'{profile_id}.prof'))
+    (directory / f'{profile_id}.json').write_text(json.dumps(summary, default=str), encoding='utf-8')
+    _evict(directory)
+    return profile_id
+
+
+def _evict(directory):
+    captures = sorted(directory.glob('*.json'))
+    for stale in captures[:max(len(captures) - settings.PROFILING['MAX_PROFILES'], 0)]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Return capture summaries, newest first"""
+    summaries = []
+    for path in sorted(profile_dir().glob('*.json'), reverse=True):
+        try:
+            summaries.append(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            continue
+    return summaries
+
+
+def profile_path(profile_id, suffix):
+    """Return the path of a capture file, or None for unknown/invalid ids"""
+    if not PROFILE_ID.match(profile_id) or suffix not in ('.json', '.prof'):
+        return None
+    path = profile_dir() / f'{profile_id}{suffix}'
+    return path if path.exists() else None
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from django.urls import path
+from core.profiling import views
+
+urlpatterns = [
+    path('', admin.site.admin_view(views.profile_list), name='profile_list'),
+    path('<str:profile_id>.<str:kind>', admin.site.admin_view(views.profile_download), name='profile_download'),
+]
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+
+from .storage import list_profiles, profile_path
+
+
+def profile_list(request):
+    """
+    Admin page listing captured request profiles
+    """
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': list_profiles(),
+    }
+    return TemplateResponse(request, 'profiling/profile_list.html', context)
+
+
+def profile_download(request, profile_id, kind):
+    """
+    Download a capture summary (json) or its pstats dump (prof)
+    """
+    path = profile_path(profile_id, f'.{kind}')
+    if path is None:
+        raise Http404('Profile not found')
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
@@ -1,11 +1,28 @@
-from django.contrib import admin
-from .models import Student, Parent, Instructor, UserProfile
+from django.contrib import admin, messages
+from .models import AGE_BANDS, ArchivedStudent, Student, Parent, Instructor, UserProfile
+from .term_end import archive_graduates, graduates, promote_students
+
+
+class AgeBandListFilter(admin.SimpleListFilter):
+    """
+    Filter by age band using a birth_date range in the database
+    """
+    title = 'age'
+    parameter_name = 'age_band'
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, label, _low, _high in AGE_BANDS]
+
+    def queryset(self, request, queryset):
+        if self.value() in dict(self.lookup_choices):
+            return queryset.in_age_band(self.value())
+        return queryset
 
 
 @admin.register(Parent)
 class ParentAdmin(admin.ModelAdmin):
     list_display = ['user', 'phone_number', 'occupation', 'created_at']
-    list_filter = ['created_at', 'occupation']
+    list_filter = ['created_at', 'occupation', AgeBandListFilter]
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'phone_number']
     readonly_fields = ['created_at', 'updated_at']
 
@@ -13,15 +30,42 @@ class ParentAdmin(admin.ModelAdmin):
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ['user', 'student_id', 'grade_level', 'gpa', 'major', 'enrollment_date']
-    list_filter = ['grade_level', 'enrollment_date', 'major']
+    list_filter = ['grade_level', 'enrollment_date', 'major', AgeBandListFilter]
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'student_id']
     readonly_fields = ['created_at', 'updated_at']
+    actions = ['promote_selected', 'archive_selected_graduates']
+
+    @admin.action(description='Promote selected students to the next grade')
+    def promote_selected(self, request, queryset):
+        promoted = promote_students(queryset)
+        self.message_user(request, f'Promoted {promoted} student(s).', messages.SUCCESS)
+
+    @admin.action(description='Archive selected students who have graduated')
+    def archive_selected_graduates(self, request, queryset):
+        skipped = queryset.count() - graduates(queryset).count()
+        archived = archive_graduates(queryset)
+        self.message_user(request, f'Archived {archived} graduated student(s).', messages.SUCCESS)
+        if skipped:
+            self.message_user(request, f'Skipped {skipped} student(s) who have not graduated yet.', messages.WARNING)
+
+
+@admin.register(ArchivedStudent)
+class ArchivedStudentAdmin(admin.ModelAdmin):
+    list_display = ['user', 'student_id', 'graduation_year', 'gpa', 'major', 'archived_at']
+    list_filter = ['graduation_year', 'major']
+    search_fields = ['user__username', 'user__first_name', 'user__last_name', 'student_id']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Instructor)
 class InstructorAdmin(admin.ModelAdmin):
     list_display = ['user', 'employee_id', 'department', 'specialization', 'years_experience']
-    list_filter = ['department', 'specialization', 'hire_date']
+    list_filter = ['department', 'specialization', 'hire_date', AgeBandListFilter]
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'employee_id']
     readonly_fields = ['created_at', 'updated_at']
 
@@ -30,6 +74,6 @@ class InstructorAdmin(admin.ModelAdmin):
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'phone_number', 'occupation', 'created_at']
-    list_filter = ['created_at', 'occupation']
+    list_filter = ['created_at', 'occupation', AgeBandListFilter]
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'phone_number']
     readonly_fields = ['created_at', 'updated_at']
@@ -5,3 +5,8 @@ class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.user'
     verbose_name = 'User Management'
+
+    def ready(self):
+        from . import checks  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
+        from .signals import connect_signals  # pylint: disable=import-outside-toplevel
+        connect_signals()
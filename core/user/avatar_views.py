@@ -0,0 +1,147 @@
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .avatars import (
+    DIGEST, PILLOW_AVAILABLE, AvatarError, avatar_directory, avatar_urls, schedule_variants, sniff_content_type,
+    store_original,
+)
+from .models import Instructor, Parent, Student
+from .thumbnails import variant_name
+
+logger = logging.getLogger(__name__)
+
+AVATAR_MODELS = {
+    'students': Student,
+    'parents': Parent,
+    'instructors': Instructor,
+}
+
+# Variants served before they are rendered fall back to the original, which
+# must not be cached as if it were the variant
+FALLBACK_MAX_AGE = 60
+
+# Room for the multipart boundaries and headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def limit_upload_size(view):
+    """Refuse oversized uploads from Content-Length, before the body is read"""
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        limit = settings.AVATARS['MAX_UPLOAD_SIZE']
+        if length > limit + MULTIPART_OVERHEAD:
+            return JsonResponse({
+                'error': f'Avatar must be at most {limit // (1024 * 1024)} MB'
+            }, status=413)
+        return view(request, *args, **kwargs)
+    return wrapped
+
+
+@limit_upload_size
+@api_view(['POST', 'DELETE'])
+@parser_classes([MultiPartParser])
+@permission_classes([IsAuthenticated])
+def avatar_upload(request, resource, pk):
+    """
+    Upload (multipart field ``avatar``) or remove the avatar of a student,
+    parent or instructor. Allowed for the profile's own user and for staff.
+    Uploads are stripped of metadata; resized variants are rendered in the
+    background.
+    """
+    profile = AVATAR_MODELS[resource].objects.filter(pk=pk).first()
+    if profile is None:
+        return Response({
+            'error': 'Not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    if profile.user_id != request.user.id and not request.user.is_staff:
+        return Response({
+            'error': 'You may only change your own avatar'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    if request.method == 'DELETE':
+        profile.avatar_hash = ''
+        profile.save(update_fields=['avatar_hash', 'updated_at'])
+        return Response({
+            'message': 'Avatar removed'
+        }, status=status.HTTP_200_OK)
+
+    if not PILLOW_AVAILABLE:
+        logger.error('Avatar upload refused: Pillow is not installed')
+        return Response({
+            'error': 'Avatar uploads are unavailable'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    upload = request.FILES.get('avatar')
+    if upload is None:
+        return Response({
+            'error': 'An avatar file is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        digest = store_original(upload)
+    except AvatarError as exc:
+        return Response({
+            'error': str(exc)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    profile.avatar_hash = digest
+    profile.save(update_fields=['avatar_hash', 'updated_at'])
+    schedule_variants(digest)
+    return Response({
+        'message': 'Avatar uploaded',
+        'avatar': avatar_urls(digest)
+    }, status=status.HTTP_201_CREATED)
+
+
+def _pick_variant(directory, variant, accept):
+    """Return (path, content type) of the best rendered format, or None"""
+    formats = settings.AVATARS['FORMATS']
+    if 'image/webp' not in accept:
+        formats = [fmt for fmt in formats if fmt != 'webp']
+    for fmt in formats:
+        path = directory / variant_name(variant, fmt)
+        if path.exists():
+            return path, f'image/{fmt}'
+    return None
+
+
+@require_GET
+def avatar_file(request, digest, variant):
+    """
+    Serve an avatar size variant by content hash
+    URLs embed the hash of the original, so responses are cached as immutable.
+    Variants are WebP for clients that accept it, JPEG otherwise; the
+    original itself is not served except as a stand-in until they exist.
+    """
+    if not DIGEST.match(digest) or variant not in settings.AVATARS['SIZES']:
+        raise Http404
+    directory = avatar_directory(digest)
+    original = directory / 'original'
+    if not original.exists():
+        raise Http404
+
+    cache_control = f"public, max-age={settings.AVATARS['CACHE_MAX_AGE']}, immutable"
+    picked = _pick_variant(directory, variant, request.META.get('HTTP_ACCEPT', ''))
+    if picked is None:
+        cache_control = f'public, max-age={FALLBACK_MAX_AGE}'
+        with open(original, 'rb') as head:
+            picked = original, sniff_content_type(head.read(12))
+
+    path, content_type = picked
+    response = FileResponse(open(path, 'rb'), content_type=content_type)  # pylint: disable=consider-using-with
+    response.headers['Cache-Control'] = cache_control
+    patch_vary_headers(response, ('Accept',))
+    return response
+
@@ -0,0 +1,190 @@
+"""
+Content-addressed avatar storage
+
+Uploads are re-encoded without their metadata (EXIF, including GPS
+position) and stored under AVATARS['DIRECTORY'] by the SHA-256 of the
+result (``ab/<hash>/original``), so identical uploads share one copy and
+every URL that contains the hash points at content that never changes.
+Resized WebP/JPEG variants are rendered next to the original by a process
+pool (core/user/thumbnails.py) after the upload has been answered; only
+variants have public URLs. Both steps need Pillow (in requirements.txt):
+without it uploads are refused and a system check warns (user.W001).
+"""
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import reverse
+
+from .thumbnails import render_variants, strip_metadata, variant_name
+
+logger = logging.getLogger(__name__)
+
+PILLOW_AVAILABLE = importlib.util.find_spec('PIL') is not None
+
+DIGEST = re.compile(r'^[0-9a-f]{64}$')
+
+# Seconds an upload waits for its metadata to be stripped
+STRIP_TIMEOUT = 30
+
+# Leading bytes of the accepted image types
+SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+class AvatarError(ValueError):
+    """Raised when an upload is not an acceptable avatar"""
+
+
+def sniff_content_type(head):
+    """Return the image content type of a file from its first bytes, or None"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+def avatar_directory(digest):
+    return Path(settings.AVATARS['DIRECTORY']) / digest[:2] / digest
+
+
+def store_original(upload):
+    """
+    Store an uploaded file without its metadata and return its digest
+    Raises AvatarError for files that are too large or not images.
+    """
+    config = settings.AVATARS
+    if upload.size > config['MAX_UPLOAD_SIZE']:
+        raise AvatarError(f"Avatar must be at most {config['MAX_UPLOAD_SIZE'] // (1024 * 1024)} MB")
+
+    root = Path(config['DIRECTORY'])
+    root.mkdir(parents=True, exist_ok=True)
+    head = b''
+    with tempfile.NamedTemporaryFile(dir=root, delete=False) as temporary:
+        try:
+            for chunk in upload.chunks():
+                if len(head) < 12:
+                    head += chunk[:12]
+                temporary.write(chunk)
+        except BaseException:
+            os.unlink(temporary.name)
+            raise
+    try:
+        if sniff_content_type(head) is None:
+            raise AvatarError('Avatar must be a JPEG, PNG, GIF or WebP image')
+        try:
+            _submit(strip_metadata, temporary.name).result(STRIP_TIMEOUT)
+        except Exception as exc:
+            logger.warning('Could not re-encode avatar upload: %s', exc)
+            raise AvatarError('Avatar could not be read as an image') from exc
+        digest = _file_digest(temporary.name)
+    except BaseException:
+        os.unlink(temporary.name)
+        raise
+
+    os.chmod(temporary.name, 0o644)
+    directory = avatar_directory(digest)
+    directory.mkdir(parents=True, exist_ok=True)
+    if (directory / 'original').exists():
+        os.unlink(temporary.name)  # same image uploaded before
+    else:
+        os.replace(temporary.name, directory / 'original')
+    return digest
+
+
+def _file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as stored:
+        for chunk in iter(lambda: stored.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def variants_ready(digest):
+    config = settings.AVATARS
+    directory = avatar_directory(digest)
+    return all(
+        (directory / variant_name(label, fmt)).exists()
+        for label in config['SIZES'] for fmt in config['FORMATS']
+    )
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(replace=False):
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if replace and _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            # Spawned workers only import core.user.thumbnails, not Django
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.AVATARS['WORKERS'],
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _log_failure(digest, future):
+    if future.exception() is not None:
+        logger.error('Could not render avatar variants for %s', digest, exc_info=future.exception())
+
+
+def _submit(*job):
+    try:
+        return _get_executor().submit(*job)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool
+        return _get_executor(replace=True).submit(*job)
+
+
+def schedule_variants(digest):
+    """Render the variants of an avatar in the background, unless already done"""
+    if not PILLOW_AVAILABLE or variants_ready(digest):
+        return None
+    config = settings.AVATARS
+    directory = avatar_directory(digest)
+    future = _submit(render_variants, str(directory / 'original'), str(directory),
+                     config['SIZES'], config['FORMATS'], config['QUALITY'])
+    future.add_done_callback(lambda done: _log_failure(digest, done))
+    return future
+
+
+def avatar_url(digest, variant='small'):
+    """URL of an avatar variant (a key of AVATARS['SIZES']), or None"""
+    if not digest:
+        return None
+    return reverse('avatar_file', args=[digest, variant])
+
+
+def avatar_urls(digest):
+    return {variant: avatar_url(digest, variant) for variant in settings.AVATARS['SIZES']}
+
+
+def _reset_after_fork():
+    # Worker processes of the parent's pool are not ours to use
+    global _executor, _executor_lock  # pylint: disable=global-statement
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,15 @@
+from django.core.checks import Warning as CheckWarning, register
+
+from .avatars import PILLOW_AVAILABLE
+
+
+@register()
+def pillow_check(app_configs, **kwargs):
+    """Avatar uploads cannot be stripped of metadata or resized without Pillow"""
+    if PILLOW_AVAILABLE:
+        return []
+    return [CheckWarning(
+        'Pillow is not installed, so avatar uploads are refused.',
+        hint='pip install -r requirements.txt',
+        id='user.W001',
+    )]
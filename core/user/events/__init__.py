@@ -0,0 +1,29 @@
+"""
+Change events for Student, Parent and Instructor rows
+
+Model signals publish ``{'resource', 'action', 'object_id'}`` events to the
+broker configured by EVENT_BROKER; core.user.events.asgi streams them to
+connected clients over Server-Sent Events or WebSocket.
+"""
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_broker = None
+
+
+def get_broker():
+    """Return the process-wide broker instance (EVENT_BROKER)"""
+    global _broker  # pylint: disable=global-statement
+    if _broker is None:
+        _broker = import_string(settings.EVENT_BROKER)()
+    return _broker
+
+
+def publish_change(resource, action, object_id):
+    """Publish a row change to subscribed clients"""
+    get_broker().publish({
+        'type': 'change',
+        'resource': resource,
+        'action': action,
+        'object_id': object_id,
+    })
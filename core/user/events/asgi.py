@@ -0,0 +1,244 @@
+"""
+ASGI push channel for row change events
+
+Serves EVENT_STREAM_PATH as Server-Sent Events (plain GET) or WebSocket,
+and hands every other request to the Django ASGI application. Idle
+connections cost one coroutine and one bounded queue each, so a single
+event loop can hold many of them.
+"""
+import asyncio
+import json
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.http.cookie import parse_cookie
+
+from . import get_broker
+
+
+def _headers(scope):
+    return {name.decode('latin-1'): value.decode('latin-1') for name, value in scope.get('headers', [])}
+
+
+def _origin_allowed(origin, host):
+    """
+    Allow same-origin requests and the explicit EVENT_STREAM_ALLOWED_ORIGINS
+    The stream authenticates with the session cookie, so the allow-all CORS
+    setting is deliberately ignored: any site could otherwise open an
+    authenticated stream. Requests without an Origin do not come from a
+    browser page and carry no ambient credentials of another site.
+    """
+    if not origin:
+        return True
+    if host and urlsplit(origin).netloc == host:
+        return True
+    return origin in settings.EVENT_STREAM_ALLOWED_ORIGINS
+
+
+def _load_user(session_key):
+    """Resolve the session cookie to an active user, or None"""
+    close_old_connections()
+    try:
+        session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        user = get_user(SimpleNamespace(session=session))
+        return user if user.is_authenticated and user.is_active else None
+    finally:
+        close_old_connections()
+
+
+async def authenticate(scope):
+    """Authenticate a connection with the Django session cookie"""
+    cookies = parse_cookie(_headers(scope).get('cookie', ''))
+    session_key = cookies.get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return None, None
+    user = await sync_to_async(_load_user)(session_key)
+    return user, session_key
+
+
+def allowed_resources(user, scope):
+    """
+    Resources this connection may receive, narrowed by ?resources=
+    Staff receive every resource; other users the EVENT_STREAM_RESOURCES
+    """
+    permitted = {'students', 'parents', 'instructors'}
+    if not user.is_staff:
+        permitted &= set(settings.EVENT_STREAM_RESOURCES)
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    requested = {name for value in query.get('resources', []) for name in value.split(',') if name}
+    return permitted & requested if requested else permitted
+
+
+class EventStream:
+    """
+    Relay broker events to one connection until it disconnects
+
+    ``emit`` sends one event and ``heartbeat`` keeps idle connections (and
+    proxies) alive; both are awaited, so a slow client stalls only its own
+    pump and its queue overflows into a ``resync`` event.
+    """
+
+    def __init__(self, user, session_key, resources, emit, heartbeat):
+        self.user = user
+        self.session_key = session_key
+        self.resources = resources
+        self.emit = emit
+        self.heartbeat = heartbeat
+
+    def wants(self, event):
+        return event['type'] != 'change' or event['resource'] in self.resources
+
+    async def session_valid(self):
+        user = await sync_to_async(_load_user)(self.session_key)
+        return user is not None and user.pk == self.user.pk
+
+    async def run(self, disconnected):
+        broker = get_broker()
+        subscription = broker.subscribe(settings.EVENT_STREAM_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        recheck_at = loop.time() + settings.EVENT_STREAM_SESSION_RECHECK
+        next_event = asyncio.ensure_future(subscription.get())
+        disconnect = asyncio.ensure_future(disconnected.wait())
+        try:
+            while not disconnected.is_set():
+                done, _ = await asyncio.wait(
+                    {next_event, disconnect},
+                    timeout=settings.EVENT_STREAM_HEARTBEAT,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if next_event in done:
+                    event = next_event.result()
+                    next_event = asyncio.ensure_future(subscription.get())
+                    if self.wants(event):
+                        await self.emit(event)
+                elif not disconnected.is_set():
+                    await self.heartbeat()
+
+                if loop.time() >= recheck_at:
+                    # Signed out or deactivated users stop receiving events
+                    if not await self.session_valid():
+                        return
+                    recheck_at = loop.time() + settings.EVENT_STREAM_SESSION_RECHECK
+        finally:
+            next_event.cancel()
+            disconnect.cancel()
+            broker.unsubscribe(subscription)
+
+
+async def _watch_disconnect(receive, disconnected, message_type):
+    while True:
+        message = await receive()
+        if message['type'] == message_type:
+            disconnected.set()
+            return
+
+
+async def serve_sse(scope, receive, send):
+    """Serve the event stream as text/event-stream"""
+    headers = _headers(scope)
+    user, session_key = await authenticate(scope)
+    origin = headers.get('origin')
+    response_headers = [(b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no')]
+    if origin and _origin_allowed(origin, headers.get('host')):
+        response_headers += [
+            (b'access-control-allow-origin', origin.encode('latin-1')),
+            (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin'),
+        ]
+
+    if scope['method'] != 'GET' or user is None:
+        code, body = (405, b'Method not allowed') if scope['method'] != 'GET' else (401, b'Authentication required')
+        await send({'type': 'http.response.start', 'status': code,
+                    'headers': response_headers + [(b'content-type', b'text/plain')]})
+        await send({'type': 'http.response.body', 'body': body})
+        return
+
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': response_headers + [(b'content-type', b'text/event-stream')]})
+    await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n', 'more_body': True})
+
+    async def emit(event):
+        data = json.dumps(event)
+        chunk = f'id: {event["id"]}\nevent: {event["type"]}\ndata: {data}\n\n'
+        await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+    async def heartbeat():
+        await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+
+    disconnected = asyncio.Event()
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, disconnected, 'http.disconnect'))
+    try:
+        stream = EventStream(user, session_key, allowed_resources(user, scope), emit, heartbeat)
+        await stream.run(disconnected)
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        watcher.cancel()
+
+
+async def serve_websocket(scope, receive, send):
+    """Serve the event stream as WebSocket text frames"""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    headers = _headers(scope)
+    if not _origin_allowed(headers.get('origin'), headers.get('host')):
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+    user, session_key = await authenticate(scope)
+    if user is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    await send({'type': 'websocket.accept'})
+
+    async def emit(event):
+        await send({'type': 'websocket.send', 'text': json.dumps(event)})
+
+    async def heartbeat():
+        await send({'type': 'websocket.send', 'text': json.dumps({'type': 'heartbeat'})})
+
+    disconnected = asyncio.Event()
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, disconnected, 'websocket.disconnect'))
+    try:
+        stream = EventStream(user, session_key, allowed_resources(user, scope), emit, heartbeat)
+        await stream.run(disconnected)
+        if not disconnected.is_set():
+            await send({'type': 'websocket.close', 'code': 4401})
+    finally:
+        watcher.cancel()
+
+
+class EventStreamRouter:
+    """
+    Route EVENT_STREAM_PATH to the push channel and everything else to Django
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'websocket':
+            if scope['path'] == settings.EVENT_STREAM_PATH:
+                await serve_websocket(scope, receive, send)
+            else:
+                await send({'type': 'websocket.close', 'code': 4404})
+        elif scope['type'] == 'http' and scope['path'] == settings.EVENT_STREAM_PATH:
+            await serve_sse(scope, receive, send)
+        else:
+            await self.application(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
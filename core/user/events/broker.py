@@ -0,0 +1,155 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    """
+    Interface for change-event brokers
+
+    ``publish`` is called from synchronous code (model signal handlers,
+    possibly on worker threads); ``subscribe`` is called from the event loop
+    serving the stream connections. A multi-node broker publishes to a
+    shared channel and fans received events out locally (see RedisBroker).
+    """
+
+    def publish(self, event):
+        raise NotImplementedError
+
+    def subscribe(self, queue_size):
+        """Return a Subscription registered on the running event loop"""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class Subscription:
+    """
+    A connection's bounded event queue
+
+    When the queue is full the pending events are discarded and replaced by
+    a single ``resync`` event, so a slow client cannot grow memory without
+    bound; it is told to refetch instead.
+    """
+
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'id': event['id'], 'type': 'resync'})
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InMemoryBroker(Broker):
+    """
+    Single-process broker fanning events out to every subscription on one
+    event loop. Events published while nothing is subscribed are discarded.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._loop = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def publish(self, event):
+        with self._lock:
+            loop = self._loop
+            if loop is None or not self._subscriptions:
+                return
+            event = {'id': next(self._ids), **event}
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.deliver(event)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self.deliver, event)
+
+    def deliver(self, event):
+        """Fan an event out to local subscriptions; must run on the event loop"""
+        for subscription in list(self._subscriptions):
+            subscription.offer(event)
+
+    def subscribe(self, queue_size):
+        subscription = Subscription(queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+
+class RedisBroker(InMemoryBroker):
+    """
+    Multi-node broker: events are published to a Redis pub/sub channel
+    (EVENT_BROKER_CHANNEL on EVENT_BROKER_URL) and each node relays what it
+    receives to its local subscriptions. The listener thread starts with the
+    first subscription, so nodes without stream connections only publish.
+    """
+
+    def __init__(self):
+        if redis is None:
+            raise ImproperlyConfigured('RedisBroker requires the redis package')
+        super().__init__()
+        self.channel = settings.EVENT_BROKER_CHANNEL
+        self.client = redis.Redis.from_url(settings.EVENT_BROKER_URL)
+        self._listener = None
+
+    def publish(self, event):
+        try:
+            self.client.publish(self.channel, json.dumps(event))
+        except redis.RedisError:
+            logger.exception('Could not publish change event to %s', self.channel)
+
+    def subscribe(self, queue_size):
+        subscription = super().subscribe(queue_size)
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='event-broker', daemon=True)
+                self._listener.start()
+        return subscription
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        # Local fan-out assigns the connection-facing event ids
+                        super().publish(json.loads(message['data']))
+            except redis.RedisError:
+                logger.exception('Lost the event broker channel, reconnecting')
+                time.sleep(1)
@@ -0,0 +1,206 @@
+"""
+Collision-free allocation of student_id and employee_id values
+
+Ids are numbered from an IdSequence row per id type. A process reserves a
+block of ID_BLOCK_SIZE numbers with a single ``UPDATE ... RETURNING`` and
+then formats ids locally (``PREFIX`` + zero-padded number, see
+ID_SEQUENCES), so concurrent workers never guess, collide or retry.
+
+Blocks are reserved on a separate autocommit connection, so the sequence row
+is never locked for the length of a caller's transaction; numbers of rolled
+back saves and of blocks left over at shutdown are skipped (ids may have
+gaps). SQLite is the exception: it has one writer per database, so a second
+connection would wait for the caller's transaction. There a transaction
+reserves exactly the numbers it needs on its own connection and caches
+nothing, and a rollback returns them.
+"""
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connection, connections, transaction
+
+# Existing columns scanned once, when a sequence is first created, so new
+# numbers start after any ids that were assigned by hand
+SEQUENCE_SOURCES = {
+    'student_id': (('user', 'Student'), ('user', 'ArchivedStudent')),
+    'employee_id': (('user', 'Instructor'),),
+}
+
+
+def _supports_update_returning(conn):
+    if conn.vendor == 'postgresql':
+        return True
+    return conn.vendor == 'sqlite' and sqlite3.sqlite_version_info >= (3, 35)
+
+
+def _separate_connection():
+    return connection.vendor != 'sqlite'
+
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+@contextmanager
+def _sequence_connection():
+    """Yield the connection to reserve numbers on (see the module docstring)"""
+    global _connection  # pylint: disable=global-statement
+    if not _separate_connection():
+        yield connections[DEFAULT_DB_ALIAS]
+        return
+    with _connection_lock:
+        if _connection is None:
+            _connection = connections.create_connection(DEFAULT_DB_ALIAS)
+            _connection.inc_thread_sharing()  # guarded by _connection_lock
+        _connection.close_if_unusable_or_obsolete()
+        yield _connection
+
+
+@contextmanager
+def _atomic(conn):
+    if conn is connections[DEFAULT_DB_ALIAS]:
+        with transaction.atomic():
+            yield
+        return
+    conn.set_autocommit(False)
+    try:
+        yield
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.set_autocommit(True)
+
+
+def _increment(conn, table, name, size):
+    """Add ``size`` to a sequence and return its previous value, or None if it does not exist"""
+    if _supports_update_returning(conn):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET next_value = next_value + %s WHERE name = %s RETURNING next_value',
+                [size, name],
+            )
+            row = cursor.fetchone()
+        return row[0] - size if row else None
+    with _atomic(conn), conn.cursor() as cursor:
+        cursor.execute(f'UPDATE {table} SET next_value = next_value + %s WHERE name = %s', [size, name])
+        if not cursor.rowcount:
+            return None
+        cursor.execute(f'SELECT next_value FROM {table} WHERE name = %s', [name])
+        return cursor.fetchone()[0] - size
+
+
+def _highest_existing(name, prefix):
+    pattern = re.compile(rf'^{re.escape(prefix)}(\d+)$')
+    highest = 0
+    for app_label, model_name in SEQUENCE_SOURCES.get(name, ()):
+        model = apps.get_model(app_label, model_name)
+        for value in model.objects.filter(**{f'{name}__startswith': prefix}).values_list(name, flat=True):
+            match = pattern.match(value)
+            if match:
+                highest = max(highest, int(match.group(1)))
+    return highest
+
+
+class IdAllocator:
+    """Hands out formatted ids for one sequence from locally cached blocks"""
+
+    def __init__(self, name):
+        config = settings.ID_SEQUENCES[name]
+        self.name = name
+        self.prefix = config['PREFIX']
+        self.width = config['WIDTH']
+        self.start = config.get('START', 1)
+        self._lock = threading.Lock()
+        self._next = self._limit = 0
+
+    def reset(self):
+        """Forget the cached block (its unused numbers are skipped)"""
+        with self._lock:
+            self._next = self._limit = 0
+
+    def format(self, number):
+        return f'{self.prefix}{number:0{self.width}d}'
+
+    def allocate(self, count=1):
+        """Return ``count`` new, unique ids"""
+        if connection.in_atomic_block and not _separate_connection():
+            first = self._reserve(count)
+            return [self.format(number) for number in range(first, first + count)]
+
+        numbers = []
+        with self._lock:
+            while len(numbers) < count:
+                if self._next >= self._limit:
+                    size = max(settings.ID_BLOCK_SIZE, count - len(numbers))
+                    self._next = self._reserve(size)
+                    self._limit = self._next + size
+                take = min(count - len(numbers), self._limit - self._next)
+                numbers.extend(range(self._next, self._next + take))
+                self._next += take
+        return [self.format(number) for number in numbers]
+
+    def _reserve(self, size):
+        """Reserve ``size`` consecutive numbers and return the first one"""
+        table = apps.get_model('user', 'IdSequence')._meta.db_table
+        with _sequence_connection() as conn:
+            while True:
+                first = _increment(conn, table, self.name, size)
+                if first is not None:
+                    return first
+                self._create_sequence(conn, table)
+
+    def _create_sequence(self, conn, table):
+        first = max(self.start, _highest_existing(self.name, self.prefix) + 1)
+        try:
+            with _atomic(conn), conn.cursor() as cursor:
+                cursor.execute(f'INSERT INTO {table} (name, next_value) VALUES (%s, %s)', [self.name, first])
+        except IntegrityError:
+            pass  # another worker created it first
+
+
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(name):
+    with _allocators_lock:
+        if name not in _allocators:
+            _allocators[name] = IdAllocator(name)
+        return _allocators[name]
+
+
+def allocate_id(name):
+    """Return one new id for the ``name`` sequence (e.g. 'student_id')"""
+    return get_allocator(name).allocate(1)[0]
+
+
+def assign_missing_ids(objs, name):
+    """Fill ``name`` on every object that does not have one, in one reservation"""
+    missing = [obj for obj in objs if not getattr(obj, name)]
+    if missing:
+        for obj, value in zip(missing, get_allocator(name).allocate(len(missing))):
+            setattr(obj, name, value)
+
+
+def _reset_after_fork():
+    # Forked workers must not reuse the parent's cached block or reservation
+    # connection; locks may have been held by other threads of the parent,
+    # so they are replaced
+    global _allocators_lock, _connection, _connection_lock  # pylint: disable=global-statement
+    _allocators_lock = threading.Lock()
+    _connection = None
+    _connection_lock = threading.Lock()
+    for allocator in _allocators.values():
+        allocator._lock = threading.Lock()  # pylint: disable=protected-access
+        allocator.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
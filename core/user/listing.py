@@ -0,0 +1,184 @@
+"""
+Sparse fieldsets, filtering and sorting for the list endpoints
+
+Query parameters:
+    ?fields=student_id,grade_level     only return these fields (id is always included)
+    ?filter[grade_level]=10,11         WHERE grade_level IN ('10', '11')
+    ?sort=-grade_level                 ORDER BY grade_level DESC
+    ?page=2&page_size=50               LIMIT 50 OFFSET 50
+
+Every name is checked against a per-endpoint whitelist and translated into
+a projected ``.values()`` query, so the database only reads, and the API
+only serialises, what the client asked for.
+"""
+import re
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+
+FILTER_PARAM = re.compile(r'^filter\[(?P<name>[a-z_]+)\]$')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Deeper pages would scan (and skip) this many rows; use filters instead
+MAX_OFFSET = 100_000
+
+
+class ListParamError(ValueError):
+    """Raised when a list query parameter is not allowed"""
+
+
+class ListSpec:
+    """
+    Whitelist of the public fields, filters and sort keys of a list endpoint
+
+    ``fields`` maps public names to ORM paths; paths through a relation
+    (``user__email``) are rendered as nested objects (``{'user': {'email': ...}}``).
+    ``sorts`` should only contain indexed columns.
+    """
+
+    def __init__(self, fields, default_fields, filters, sorts, annotations=None, formatters=None):
+        self.fields = fields
+        self.default_fields = default_fields
+        self.filters = filters
+        self.sorts = sorts
+        self.annotations = annotations or {}
+        self.formatters = formatters or {}
+
+    def parse_fields(self, params):
+        raw = params.get('fields')
+        if not raw:
+            return list(self.default_fields)
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ListParamError(f'Unknown field(s): {", ".join(unknown)}')
+        if 'id' not in names:
+            names.insert(0, 'id')
+        return names
+
+    def parse_filters(self, params, model=None):
+        """
+        Translate ?filter[...]= parameters into ORM lookups
+        With ``model``, each value is converted by its field's ``to_python``
+        so malformed values are rejected here instead of failing in the query.
+        """
+        lookups = {}
+        for key, value in params.items():
+            match = FILTER_PARAM.match(key)
+            if not match:
+                continue
+            name = match.group('name')
+            if name not in self.filters:
+                raise ListParamError(f'Filtering by "{name}" is not supported')
+            values = [item.strip() for item in value.split(',')]
+            path = self.filters[name]
+            if model is not None:
+                values = [_coerce(model, path, name, item) for item in values]
+            if len(values) == 1:
+                lookups[path] = values[0]
+            else:
+                lookups[f'{path}__in'] = values
+        return lookups
+
+    def parse_sort(self, params):
+        raw = params.get('sort')
+        if not raw:
+            return []
+        ordering = []
+        for key in (item.strip() for item in raw.split(',') if item.strip()):
+            descending = key.startswith('-')
+            name = key.lstrip('-')
+            if name not in self.sorts:
+                raise ListParamError(f'Sorting by "{name}" is not supported')
+            ordering.append(f'{"-" if descending else ""}{self.sorts[name]}')
+        return ordering
+
+    def apply(self, queryset, params):
+        """
+        Return ``(rows, names)`` for the projected, filtered and sorted queryset
+        Raises ListParamError for anything outside the whitelist
+        """
+        names = self.parse_fields(params)
+        queryset = queryset.filter(**self.parse_filters(params, queryset.model))
+
+        ordering = self.parse_sort(params)
+        if ordering:
+            # Keep the default ordering as a tie-breaker for a stable order
+            queryset = queryset.order_by(*ordering, *queryset.model._meta.ordering, 'pk')
+
+        annotations = {name: self.annotations[name] for name in names if name in self.annotations}
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+
+        return queryset.values(*(self.fields[name] for name in names)), names
+
+    def render(self, rows, names):
+        """Nest relation paths and apply formatters to ``.values()`` rows"""
+        results = []
+        for row in rows:
+            item = {}
+            for name in names:
+                path = self.fields[name]
+                value = row[path]
+                if name in self.formatters:
+                    value = self.formatters[name](value)
+                *parents, leaf = path.split('__')
+                target = item
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[leaf] = value
+            results.append(item)
+        return results
+
+
+def _coerce(model, path, name, value):
+    """Convert a filter value with the model field at ``path``"""
+    *relations, leaf = path.split('__')
+    try:
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        field = model._meta.get_field(leaf)
+    except FieldDoesNotExist:
+        return value
+    try:
+        return field.to_python(value)
+    except ValidationError as exc:
+        raise ListParamError(f'Invalid value for filter "{name}": {value}') from exc
+
+
+def positive_int_param(params, name, default, maximum=None):
+    """Read a positive integer query parameter, capped at ``maximum``"""
+    raw = params.get(name)
+    if raw in (None, ''):
+        return default
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1:
+        raise ListParamError(f'{name} must be a positive integer')
+    return min(value, maximum) if maximum else value
+
+
+def wants_pagination(params):
+    """Return True when the client asked for a page"""
+    return 'page' in params or 'page_size' in params
+
+
+def paginate(queryset, params, default_size=DEFAULT_PAGE_SIZE):
+    """
+    Slice ``queryset`` with ?page= and ?page_size=
+    Returns the sliced queryset and the pagination metadata
+    """
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+    page = positive_int_param(params, 'page', 1)
+    page_size = positive_int_param(params, 'page_size', default_size, MAX_PAGE_SIZE)
+    offset = (page - 1) * page_size
+    if offset > MAX_OFFSET:
+        raise ListParamError(f'page must be at most {MAX_OFFSET // page_size + 1} for page_size {page_size}')
+    return queryset[offset:offset + page_size], {
+        'page': page,
+        'page_size': page_size,
+        'total': queryset.count(),
+    }
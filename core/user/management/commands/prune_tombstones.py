@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.user.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete delta-sync tombstones older than DELTA_SYNC_TOMBSTONE_RETENTION'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - settings.DELTA_SYNC_TOMBSTONE_RETENTION
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} tombstone(s) older than {cutoff:%Y-%m-%d %H:%M}'))
@@ -0,0 +1,41 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.user.term_end import archive_graduates, promote_students
+
+
+class Command(BaseCommand):
+    help = (
+        'Run term-end bulk operations: archive students whose graduation year '
+        'has been reached, then promote everyone else to the next grade'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-graduation', action='store_true', help='Do not archive graduates')
+        parser.add_argument('--skip-promotion', action='store_true', help='Do not promote grade levels')
+        parser.add_argument(
+            '--graduation-year', type=int, default=date.today().year,
+            help='Archive students graduating in this year or earlier (default: current year)',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.TERM_END_CHUNK_SIZE,
+            help='Rows per transaction',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would change')
+
+    def handle(self, *args, **options):
+        prefix = '[dry run] ' if options['dry_run'] else ''
+
+        if not options['skip_graduation']:
+            archived = archive_graduates(
+                graduation_year=options['graduation_year'],
+                chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'{prefix}Archived {archived} graduated student(s)'))
+
+        if not options['skip_promotion']:
+            promoted = promote_students(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+            self.stdout.write(self.style.SUCCESS(f'{prefix}Promoted {promoted} student(s)'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='instructor',
+            index=models.Index(fields=['department', 'employee_id'], name='instructor_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grade_level', 'student_id'], name='student_grade_idx'),
+        ),
+    ]
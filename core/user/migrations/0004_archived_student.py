@@ -0,0 +1,43 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_delta_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedStudent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(help_text='Primary key of the Student row this was archived from')),
+                ('phone_number', models.CharField(blank=True, max_length=17)),
+                ('birth_date', models.DateField(blank=True, null=True)),
+                ('bio', models.TextField(blank=True, max_length=500)),
+                ('avatar', models.URLField(blank=True)),
+                ('student_id', models.CharField(max_length=20, unique=True)),
+                ('grade_level', models.CharField(blank=True, max_length=20)),
+                ('enrollment_date', models.DateField()),
+                ('graduation_year', models.IntegerField(blank=True, null=True)),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('major', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_children', to='user.parent')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archived_student', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Student',
+                'verbose_name_plural': 'Archived Students',
+                'ordering': ['-graduation_year', 'student_id'],
+            },
+        ),
+    ]
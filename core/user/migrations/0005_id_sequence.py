@@ -0,0 +1,35 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_archived_student'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('next_value', models.BigIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'ID Sequence',
+                'verbose_name_plural': 'ID Sequences',
+            },
+        ),
+        migrations.AlterField(
+            model_name='instructor',
+            name='employee_id',
+            field=models.CharField(blank=True, max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='student_id',
+            field=models.CharField(blank=True, max_length=20, unique=True),
+        ),
+    ]
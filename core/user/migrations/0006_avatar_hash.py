@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_id_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedstudent',
+            name='avatar_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='instructor',
+            name='avatar_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='parent',
+            name='avatar_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='avatar_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
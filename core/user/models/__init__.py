@@ -2,10 +2,19 @@
 from .student import Student
 from .parent import Parent, UserProfile
 from .instructor import Instructor
+from .archive import ArchivedStudent
+from .changelog import Tombstone
+from .sequence import IdSequence
+from .querysets import AGE_BANDS, PersonQuerySet
 
 __all__ = [
     'Student',
     'Parent', 
     'Instructor',
     'UserProfile',
+    'ArchivedStudent',
+    'Tombstone',
+    'IdSequence',
+    'PersonQuerySet',
+    'AGE_BANDS',
 ]
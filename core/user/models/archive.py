@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model  # pylint: disable=imported-auth-user
+from django.db import models
+
+
+class ArchivedStudent(models.Model):
+    """
+    Graduated student moved out of the active Student table
+    Keeps the Student columns as they were at graduation
+    """
+    user = models.OneToOneField(get_user_model(), on_delete=models.CASCADE, related_name='archived_student')
+    original_id = models.BigIntegerField(help_text='Primary key of the Student row this was archived from')
+
+    phone_number = models.CharField(max_length=17, blank=True)
+    birth_date = models.DateField(null=True, blank=True)
+    bio = models.TextField(max_length=500, blank=True)
+    avatar = models.URLField(blank=True)
+    # Content hash of an uploaded avatar (see core/user/avatars.py)
+    avatar_hash = models.CharField(max_length=64, blank=True)
+
+    student_id = models.CharField(max_length=20, unique=True)
+    grade_level = models.CharField(max_length=20, blank=True)
+    enrollment_date = models.DateField()
+    graduation_year = models.IntegerField(null=True, blank=True)
+    gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    major = models.CharField(max_length=100, blank=True)
+
+    parent = models.ForeignKey(
+        'Parent',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_children'
+    )
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        # pylint: disable=no-member
+        return f"{self.user.username} (Graduated {self.graduation_year} - ID: {self.student_id})"
+
+    class Meta:
+        verbose_name = 'Archived Student'
+        verbose_name_plural = 'Archived Students'
+        ordering = ['-graduation_year', 'student_id']
@@ -0,0 +1,24 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Compact record of a deleted Student, Parent or Instructor
+    Lets delta-sync clients learn about deletions; pruned after
+    DELTA_SYNC_TOMBSTONE_RETENTION
+    """
+    resource = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.resource} #{self.object_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['resource', 'deleted_at'], name='tombstone_resource_idx'),
+        ]
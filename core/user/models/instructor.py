@@ -5,6 +5,9 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
 
+from ..id_allocator import allocate_id
+from .querysets import PersonQuerySet
+
 
 class Instructor(models.Model):
     """
@@ -23,9 +26,11 @@ class Instructor(models.Model):
     birth_date = models.DateField(null=True, blank=True)
     bio = models.TextField(max_length=500, blank=True)
     avatar = models.URLField(blank=True)
+    # Content hash of an uploaded avatar (see core/user/avatars.py)
+    avatar_hash = models.CharField(max_length=64, blank=True)
     
     # Instructor-specific fields
-    employee_id = models.CharField(max_length=20, unique=True)
+    employee_id = models.CharField(max_length=20, unique=True, blank=True)  # allocated on save when blank
     department = models.CharField(max_length=100, blank=True)
     specialization = models.CharField(max_length=150, blank=True)
     hire_date = models.DateField(default=date.today)
@@ -37,6 +42,11 @@ class Instructor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PersonQuerySet.as_manager()
+
+    # Filled from the ID allocator when left blank (see core/user/id_allocator.py)
+    allocated_id_field = 'employee_id'
+
     def __str__(self):
         # pylint: disable=no-member
         return f"{self.user.username} (Instructor - ID: {self.employee_id})"
@@ -66,7 +76,16 @@ class Instructor(models.Model):
         if self.years_experience < 0:
             raise ValidationError('Years of experience cannot be negative.')
 
+    def save(self, *args, **kwargs):
+        if not self.employee_id:
+            self.employee_id = allocate_id('employee_id')
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Instructor'
         verbose_name_plural = 'Instructors'
         ordering = ['employee_id']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='instructor_updated_idx'),
+            models.Index(fields=['department', 'employee_id'], name='instructor_department_idx'),
+        ]
@@ -5,6 +5,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
 
+from .querysets import PersonQuerySet
+
 
 class Parent(models.Model):
     """
@@ -23,6 +25,8 @@ class Parent(models.Model):
     birth_date = models.DateField(null=True, blank=True)
     bio = models.TextField(max_length=500, blank=True)
     avatar = models.URLField(blank=True)
+    # Content hash of an uploaded avatar (see core/user/avatars.py)
+    avatar_hash = models.CharField(max_length=64, blank=True)
     
     # Parent-specific fields
     occupation = models.CharField(max_length=100, blank=True)
@@ -32,6 +36,8 @@ class Parent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PersonQuerySet.as_manager()
+
     def __str__(self):
         # pylint: disable=no-member
         return f"{self.user.username} (Parent)"
@@ -61,6 +67,9 @@ class Parent(models.Model):
     class Meta:
         verbose_name = 'Parent'
         verbose_name_plural = 'Parents'
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='parent_updated_idx'),
+        ]
 
 
 # Keep the original UserProfile for backward compatibility
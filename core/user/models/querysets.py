@@ -0,0 +1,122 @@
+from datetime import date
+
+from django.db import models
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import ExtractYear
+
+from ..id_allocator import assign_missing_ids
+
+
+# (key, label, minimum age inclusive, maximum age exclusive)
+AGE_BANDS = (
+    ('under_13', 'Under 13', None, 13),
+    ('13_17', '13-17', 13, 18),
+    ('18_24', '18-24', 18, 25),
+    ('25_44', '25-44', 25, 45),
+    ('45_64', '45-64', 45, 65),
+    ('65_plus', '65+', 65, None),
+)
+
+
+def years_ago(years, today=None):
+    """Return the date exactly ``years`` years before ``today``"""
+    today = today or date.today()
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        # 29 February in a non-leap target year
+        return today.replace(year=today.year - years, day=28)
+
+
+def birth_date_range(min_age=None, max_age=None, today=None, field='birth_date'):
+    """
+    Translate an age interval into a lookup on a date column
+    ``min_age`` is inclusive and ``max_age`` exclusive, so the resulting
+    filter can use an index on the column instead of computing ages per row
+    """
+    lookup = {}
+    if min_age is not None:
+        lookup[f'{field}__lte'] = years_ago(min_age, today)
+    if max_age is not None:
+        lookup[f'{field}__gt'] = years_ago(max_age, today)
+    return lookup
+
+
+def age_expression(field='birth_date', today=None):
+    """
+    ORM expression computing the age in whole years from a date column
+    Mirrors the Python ``age`` property on the role models
+    """
+    today = today or date.today()
+    birthday_pending = (
+        Q(**{f'{field}__month__gt': today.month})
+        | Q(**{f'{field}__month': today.month, f'{field}__day__gt': today.day})
+    )
+    return Case(
+        When(**{f'{field}__isnull': True}, then=Value(None)),
+        default=Value(today.year) - ExtractYear(field) - Case(
+            When(birthday_pending, then=Value(1)),
+            default=Value(0),
+        ),
+        output_field=IntegerField(),
+    )
+
+
+def age_band_expression(field='birth_date', today=None):
+    """ORM expression labelling each row with its AGE_BANDS key"""
+    whens = [
+        When(Q(**birth_date_range(low, high, today, field)), then=Value(key))
+        for key, _label, low, high in AGE_BANDS
+    ]
+    return Case(
+        When(**{f'{field}__isnull': True}, then=Value(None)),
+        *whens,
+        output_field=models.CharField(),
+    )
+
+
+class PersonQuerySet(models.QuerySet):
+    """
+    Shared queryset for the role models (Student, Parent, Instructor)
+    Provides database-side age computations so age filters and groupings
+    do not require loading every row into Python
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Allocate missing public ids (see ``allocated_id_field``) in one reservation"""
+        field = getattr(self.model, 'allocated_id_field', None)
+        if field:
+            objs = list(objs)
+            assign_missing_ids(objs, field)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def with_age(self, today=None):
+        """Annotate each row with ``age_years``"""
+        return self.annotate(age_years=age_expression(today=today))
+
+    def with_age_band(self, today=None):
+        """Annotate each row with ``age_band`` (an AGE_BANDS key)"""
+        return self.annotate(age_band=age_band_expression(today=today))
+
+    def age_between(self, min_age=None, max_age=None, today=None):
+        """Filter to rows whose age is in [min_age, max_age)"""
+        return self.filter(**birth_date_range(min_age, max_age, today))
+
+    def in_age_band(self, band, today=None):
+        """Filter to rows in the given AGE_BANDS key"""
+        for key, _label, low, high in AGE_BANDS:
+            if key == band:
+                return self.age_between(low, high, today)
+        raise ValueError(f'Unknown age band: {band}')
+
+    def age_band_counts(self, today=None):
+        """Return {band: count} computed with a single GROUP BY"""
+        rows = (
+            self.filter(birth_date__isnull=False)
+            .with_age_band(today)
+            .order_by()
+            .values('age_band')
+            .annotate(total=models.Count('pk'))
+        )
+        return {row['age_band']: row['total'] for row in rows}
+
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class IdSequence(models.Model):
+    """
+    Database-backed counter used to hand out blocks of public ids
+    (student_id, employee_id); see core/user/id_allocator.py
+    """
+    name = models.CharField(max_length=50, unique=True)
+    next_value = models.BigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} (next: {self.next_value})"
+
+    class Meta:
+        verbose_name = 'ID Sequence'
+        verbose_name_plural = 'ID Sequences'
@@ -5,6 +5,9 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
 
+from ..id_allocator import allocate_id
+from .querysets import PersonQuerySet
+
 
 class Student(models.Model):
     """
@@ -23,9 +26,11 @@ class Student(models.Model):
     birth_date = models.DateField(null=True, blank=True)
     bio = models.TextField(max_length=500, blank=True)
     avatar = models.URLField(blank=True)
+    # Content hash of an uploaded avatar (see core/user/avatars.py)
+    avatar_hash = models.CharField(max_length=64, blank=True)
     
     # Student-specific fields
-    student_id = models.CharField(max_length=20, unique=True)
+    student_id = models.CharField(max_length=20, unique=True, blank=True)  # allocated on save when blank
     grade_level = models.CharField(max_length=20, blank=True)
     enrollment_date = models.DateField(auto_now_add=True)  # Changed from default=date.today
     graduation_year = models.IntegerField(null=True, blank=True)
@@ -44,6 +49,11 @@ class Student(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PersonQuerySet.as_manager()
+
+    # Filled from the ID allocator when left blank (see core/user/id_allocator.py)
+    allocated_id_field = 'student_id'
+
     def __str__(self):
         # pylint: disable=no-member
         return f"{self.user.username} (Student - ID: {self.student_id})"
@@ -73,7 +83,16 @@ class Student(models.Model):
         if self.gpa and (self.gpa < 0 or self.gpa > 4.0):
             raise ValidationError('GPA must be between 0.0 and 4.0.')
 
+    def save(self, *args, **kwargs):
+        if not self.student_id:
+            self.student_id = allocate_id('student_id')
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Student'
         verbose_name_plural = 'Students'
         ordering = ['student_id']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='student_updated_idx'),
+            models.Index(fields=['grade_level', 'student_id'], name='student_grade_idx'),
+        ]
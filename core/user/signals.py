@@ -0,0 +1,72 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .events import publish_change
+from .models import Instructor, Parent, Student, Tombstone, UserProfile
+
+# Delta-sync resource name for each tracked model
+SYNC_RESOURCES = {
+    Student: 'students',
+    Parent: 'parents',
+    Instructor: 'instructors',
+}
+
+
+def sync_resource_for(model):
+    """Return the delta-sync resource name for a model (or proxy), or None"""
+    return SYNC_RESOURCES.get(model._meta.concrete_model)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """Record deletions so delta-sync clients can drop the row"""
+    resource = sync_resource_for(sender)
+    if resource:
+        Tombstone.objects.create(resource=resource, object_id=instance.pk)
+
+
+def broadcast_save(sender, instance, created, **kwargs):
+    """Push row creations and updates to event stream subscribers once committed"""
+    resource = sync_resource_for(sender)
+    if resource:
+        action = 'created' if created else 'updated'
+        transaction.on_commit(partial(publish_change, resource, action, instance.pk))
+
+
+def broadcast_delete(sender, instance, **kwargs):
+    """Push row deletions to event stream subscribers once committed"""
+    resource = sync_resource_for(sender)
+    if resource:
+        transaction.on_commit(partial(publish_change, resource, 'deleted', instance.pk))
+
+
+# auth.User columns served by the list endpoints and delta-sync feeds
+USER_FEED_FIELDS = {'username', 'first_name', 'last_name', 'email'}
+
+
+def touch_profiles(sender, instance, update_fields=None, **kwargs):
+    """
+    Bump updated_at on a user's role rows when their name or email may have
+    changed, so delta-sync cursors (which follow the role rows) pick it up
+    """
+    if update_fields is not None and not USER_FEED_FIELDS.intersection(update_fields):
+        return  # e.g. the last_login update on sign in
+    now = timezone.now()
+    for model, resource in SYNC_RESOURCES.items():
+        pks = list(model.objects.filter(user_id=instance.pk).values_list('pk', flat=True))
+        if not pks:
+            continue
+        model.objects.filter(pk__in=pks).update(updated_at=now)
+        for pk in pks:
+            transaction.on_commit(partial(publish_change, resource, 'updated', pk))
+
+
+def connect_signals():
+    for model in (Student, Parent, UserProfile, Instructor):
+        post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'user.record_tombstone.{model.__name__}')
+        post_save.connect(broadcast_save, sender=model, dispatch_uid=f'user.broadcast_save.{model.__name__}')
+        post_delete.connect(broadcast_delete, sender=model, dispatch_uid=f'user.broadcast_delete.{model.__name__}')
+    post_save.connect(touch_profiles, sender=get_user_model(), dispatch_uid='user.touch_profiles')
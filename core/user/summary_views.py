@@ -0,0 +1,179 @@
+import functools
+import importlib
+import statistics
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Aggregate, Avg, Count, F, FloatField, IntegerField, Max, Min, Value
+from django.db.models.functions import Floor, Least
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .models import AGE_BANDS, Student
+
+GPA_ANALYTICS_CACHE_KEY = 'user:students:gpa_analytics'
+GPA_PERCENTILES = (25, 50, 75, 90)
+GPA_BUCKETS_PER_POINT = 2  # histogram bucket width of 0.5
+GPA_MAX = 4
+
+
+@functools.cache
+def _numpy():
+    """
+    Import numpy on first use, or return None when it is not installed
+    Deferred so workers that never serve analytics do not load it
+    """
+    try:
+        return importlib.import_module('numpy')
+    except ImportError:  # pragma: no cover - numpy is optional
+        return None
+
+
+class PercentileCont(Aggregate):
+    """
+    Continuous percentile aggregate (PostgreSQL ``percentile_cont``)
+    """
+    function = 'PERCENTILE_CONT'
+    name = 'PercentileCont'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def _format_gpa(value):
+    """Render a GPA value with two decimal places, or None"""
+    if value is None:
+        return None
+    return str(Decimal(value).quantize(Decimal('0.01')))
+
+
+def _round_gpa(value):
+    """Round an averaged GPA to two decimal places, or None"""
+    return round(float(value), 2) if value is not None else None
+
+
+def _gpa_percentiles(queryset):
+    """
+    Compute GPA percentiles, in the database when it supports them,
+    otherwise with a single vectorized pass over the GPA column
+    """
+    if connection.vendor == 'postgresql':
+        row = queryset.aggregate(**{
+            f'p{p}': PercentileCont('gpa', p / 100) for p in GPA_PERCENTILES
+        })
+        return {key: _round_gpa(value) for key, value in row.items()}, 'database'
+
+    values = list(queryset.values_list('gpa', flat=True))
+    if not values:
+        return {f'p{p}': None for p in GPA_PERCENTILES}, 'none'
+
+    numpy = _numpy()
+    if numpy is not None:
+        computed = numpy.percentile(numpy.array(values, dtype=float), GPA_PERCENTILES)
+        source = 'numpy'
+    elif len(values) == 1:
+        computed = [float(values[0])] * len(GPA_PERCENTILES)
+        source = 'python'
+    else:
+        cuts = statistics.quantiles([float(v) for v in values], n=100, method='inclusive')
+        computed = [cuts[p - 1] for p in GPA_PERCENTILES]
+        source = 'python'
+    return {f'p{p}': round(float(v), 2) for p, v in zip(GPA_PERCENTILES, computed)}, source
+
+
+def _gpa_histogram(queryset):
+    """Count students per GPA bucket with a single GROUP BY"""
+    last_bucket = GPA_MAX * GPA_BUCKETS_PER_POINT - 1
+    rows = (
+        queryset
+        .annotate(bucket=Least(
+            Floor(F('gpa') * Value(GPA_BUCKETS_PER_POINT)),
+            Value(last_bucket),
+            output_field=IntegerField(),
+        ))
+        .order_by()
+        .values('bucket')
+        .annotate(count=Count('pk'))
+    )
+    counts = {int(row['bucket']): row['count'] for row in rows}
+    width = 1 / GPA_BUCKETS_PER_POINT
+    return [
+        {
+            'min_gpa': bucket * width,
+            'max_gpa': (bucket + 1) * width,
+            'count': counts.get(bucket, 0),
+        }
+        for bucket in range(last_bucket + 1)
+    ]
+
+
+def _gpa_breakdown(queryset, field):
+    """Aggregate GPA statistics grouped by ``field``"""
+    rows = (
+        queryset
+        .order_by(field)
+        .values(field)
+        .annotate(count=Count('pk'), average_gpa=Avg('gpa'), min_gpa=Min('gpa'), max_gpa=Max('gpa'))
+    )
+    return [
+        {
+            field: row[field],
+            'count': row['count'],
+            'average_gpa': _round_gpa(row['average_gpa']),
+            'min_gpa': _format_gpa(row['min_gpa']),
+            'max_gpa': _format_gpa(row['max_gpa']),
+        }
+        for row in rows
+    ]
+
+
+def build_gpa_analytics():
+    """
+    Build the GPA analytics payload using database aggregates
+    """
+    graded = Student.objects.filter(gpa__isnull=False)
+    overall = graded.aggregate(count=Count('pk'), average=Avg('gpa'), minimum=Min('gpa'), maximum=Max('gpa'))
+    percentiles, percentile_source = _gpa_percentiles(graded)
+    band_counts = Student.objects.age_band_counts()
+
+    return {
+        'overall': {
+            'count': overall['count'],
+            'average_gpa': _round_gpa(overall['average']),
+            'min_gpa': _format_gpa(overall['minimum']),
+            'max_gpa': _format_gpa(overall['maximum']),
+            'percentiles': percentiles,
+        },
+        'histogram': _gpa_histogram(graded),
+        'by_grade_level': _gpa_breakdown(graded, 'grade_level'),
+        'by_major': _gpa_breakdown(graded, 'major'),
+        'age_bands': [
+            {'band': key, 'label': label, 'count': band_counts.get(key, 0)}
+            for key, label, _low, _high in AGE_BANDS
+        ],
+        'percentile_source': percentile_source,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def students_analytics(request):
+    """
+    Get GPA percentiles, histogram and averages by grade level and major
+    Results are cached for CACHE_TTL seconds
+    """
+    data = cache.get(GPA_ANALYTICS_CACHE_KEY)
+    cached = data is not None
+    if not cached:
+        data = build_gpa_analytics()
+        cache.set(GPA_ANALYTICS_CACHE_KEY, data, settings.CACHE_TTL)
+
+    return Response({
+        'analytics': data,
+        'cached': cached,
+    }, status=status.HTTP_200_OK)
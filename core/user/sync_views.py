@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .listing import ListParamError, positive_int_param
+from .models import Instructor, Parent, Student, Tombstone
+from .views import INSTRUCTOR_LIST, PARENT_LIST, STUDENT_LIST
+
+SYNC_FEEDS = {
+    'students': (Student, STUDENT_LIST),
+    'parents': (Parent, PARENT_LIST),
+    'instructors': (Instructor, INSTRUCTOR_LIST),
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(moment, last_id, deleted_moment, last_deleted_id):
+    """
+    Encode the (timestamp, id) positions of the changed-row and tombstone
+    streams as one opaque cursor
+    """
+    micros = (moment - EPOCH) // timedelta(microseconds=1)
+    deleted_micros = (deleted_moment - EPOCH) // timedelta(microseconds=1)
+    return f'{micros}-{last_id}-{deleted_micros}-{last_deleted_id}'
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor
+    Cursors from before tombstones were paged carry one position, used for both
+    """
+    try:
+        parts = [int(part) for part in cursor.split('-')]
+    except ValueError as exc:
+        raise ListParamError('Invalid cursor') from exc
+    if len(parts) == 2:
+        parts += [parts[0], 0]
+    if len(parts) != 4:
+        raise ListParamError('Invalid cursor')
+    micros, last_id, deleted_micros, last_deleted_id = parts
+    return (
+        EPOCH + timedelta(microseconds=micros), last_id,
+        EPOCH + timedelta(microseconds=deleted_micros), last_deleted_id,
+    )
+
+
+def _page_bounds(rows, limit, since, horizon, time_key):
+    """
+    Trim a ``limit + 1`` fetch and return (rows, has_more, until, until_id)
+    A full page ends at its last row; otherwise the stream is read up to the horizon
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        return rows, True, rows[-1][time_key], rows[-1]['id']
+    until = max(horizon, since)
+    until_id = rows[-1]['id'] if rows and rows[-1][time_key] == until else 0
+    return rows, False, until, until_id
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def changes_feed(request, resource):
+    """
+    Get rows changed and deleted since ?since=<cursor>
+    Omit the cursor for an initial full sync, then pass back the returned
+    cursor. Rows are paged by (updated_at, id) and deletions by
+    (deleted_at, id); ?limit= caps both. Changes to a user's name or email
+    bump the role row (see signals.touch_profiles).
+    """
+    model, spec = SYNC_FEEDS[resource]
+    params = request.query_params
+    now = timezone.now()
+    # Rows younger than this may belong to transactions that have not
+    # committed yet, so they are left for the next poll
+    horizon = now - timedelta(seconds=settings.DELTA_SYNC_SETTLE_SECONDS)
+
+    try:
+        since, since_id, deleted_since, deleted_since_id = (
+            # A full sync only needs deletions that happen while it pages
+            decode_cursor(params['since']) if params.get('since') else (EPOCH, 0, horizon, 0)
+        )
+        names = spec.parse_fields(params)
+        limit = positive_int_param(params, 'limit', settings.DELTA_SYNC_PAGE_SIZE, settings.DELTA_SYNC_PAGE_SIZE)
+    except ListParamError as exc:
+        return Response({
+            'error': str(exc)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if params.get('since') and min(since, deleted_since) < now - settings.DELTA_SYNC_TOMBSTONE_RETENTION:
+        return Response({
+            'error': 'Cursor is older than the tombstone retention window, perform a full sync'
+        }, status=status.HTTP_410_GONE)
+
+    if 'updated_at' not in names:
+        names.append('updated_at')
+    changed = (
+        model.objects
+        .filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=since_id))
+        .filter(updated_at__lte=horizon)
+        .order_by('updated_at', 'id')
+        .annotate(**{name: spec.annotations[name] for name in names if name in spec.annotations})
+        .values(*(spec.fields[name] for name in names))
+    )
+    rows, rows_more, until, until_id = _page_bounds(
+        list(changed[:limit + 1]), limit, since, horizon, 'updated_at'
+    )
+
+    # Deletions are paged separately, with the same limit, by (deleted_at, id)
+    tombstones = (
+        Tombstone.objects
+        .filter(resource=resource)
+        .filter(Q(deleted_at__gt=deleted_since) | Q(deleted_at=deleted_since, id__gt=deleted_since_id))
+        .filter(deleted_at__lte=horizon)
+        .order_by('deleted_at', 'id')
+        .values('id', 'object_id', 'deleted_at')
+    )
+    tombstones, deleted_more, deleted_until, deleted_until_id = _page_bounds(
+        list(tombstones[:limit + 1]), limit, deleted_since, horizon, 'deleted_at'
+    )
+
+    return Response({
+        resource: spec.render(rows, names),
+        'deleted': [tombstone['object_id'] for tombstone in tombstones],
+        'count': len(rows),
+        'has_more': rows_more or deleted_more,
+        'cursor': encode_cursor(until, until_id, deleted_until, deleted_until_id),
+    }, status=status.HTTP_200_OK)
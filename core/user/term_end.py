@@ -0,0 +1,120 @@
+"""
+Set-based term-end operations: grade promotion and graduation archiving
+
+Both work through the Student table in primary-key chunks, one transaction
+per chunk, so locks stay short and a failure only rolls back one chunk.
+Rows changed with ``update()`` get an explicit ``updated_at`` so delta-sync
+clients see them, and archived rows get their tombstones in one bulk INSERT.
+Model signals do not fire; each run publishes one bulk change event instead,
+and each committed chunk writes one audit event listing its students.
+"""
+from datetime import date
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+from core.audit.writer import record_event
+
+from .events import publish_change
+from .models import ArchivedStudent, Student, Tombstone
+
+ARCHIVED_FIELDS = (
+    'user_id', 'phone_number', 'birth_date', 'bio', 'avatar', 'avatar_hash', 'student_id',
+    'grade_level', 'enrollment_date', 'graduation_year', 'gpa', 'major',
+    'parent_id', 'created_at', 'updated_at',
+)
+
+
+def _pk_chunks(queryset, chunk_size):
+    """Yield lists of primary keys in ascending order"""
+    last_pk = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+        )
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def promote_students(queryset=None, progression=None, chunk_size=None, dry_run=False):
+    """
+    Move students to the next grade with one ``UPDATE ... CASE`` per chunk
+    Grades missing from the progression (e.g. the final grade) are left alone.
+    Returns the number of students promoted (or that would be, for dry runs).
+    """
+    progression = progression or settings.GRADE_PROGRESSION
+    chunk_size = chunk_size or settings.TERM_END_CHUNK_SIZE
+    queryset = (queryset if queryset is not None else Student.objects.all()).filter(
+        grade_level__in=list(progression)
+    )
+    if dry_run:
+        return queryset.count()
+
+    next_grade = Case(
+        *[When(grade_level=current, then=Value(following)) for current, following in progression.items()],
+        default='grade_level',
+    )
+    promoted = 0
+    for pks in _pk_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            promoted += Student.objects.filter(pk__in=pks).update(
+                grade_level=next_grade,
+                updated_at=timezone.now(),
+            )
+            transaction.on_commit(partial(record_event, 'updated', 'students', changes={
+                'grade_level': [[current, following] for current, following in progression.items()],
+                'object_ids': pks,
+            }))
+    if promoted:
+        publish_change('students', 'bulk_updated', None)
+    return promoted
+
+
+def graduates(queryset=None, graduation_year=None):
+    """Students whose graduation year is ``graduation_year`` (default: this year) or earlier"""
+    graduation_year = graduation_year or date.today().year
+    queryset = queryset if queryset is not None else Student.objects.all()
+    return queryset.filter(graduation_year__isnull=False, graduation_year__lte=graduation_year)
+
+
+def archive_graduates(queryset=None, graduation_year=None, chunk_size=None, dry_run=False):
+    """
+    Move graduated students into ArchivedStudent, chunk by chunk
+    Each chunk copies rows with one bulk INSERT, removes them from Student
+    with one DELETE (no per-row signals) and records their tombstones, all in
+    the same transaction. Returns the number archived.
+    """
+    chunk_size = chunk_size or settings.TERM_END_CHUNK_SIZE
+    queryset = graduates(queryset, graduation_year)
+    if dry_run:
+        return queryset.count()
+
+    archived = 0
+    for pks in _pk_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            rows = list(Student.objects.filter(pk__in=pks).values('pk', *ARCHIVED_FIELDS))
+            pks = [row['pk'] for row in rows]
+            ArchivedStudent.objects.bulk_create([
+                ArchivedStudent(original_id=row.pop('pk'), **row) for row in rows
+            ])
+            # Nothing references Student, so no cascade is skipped
+            Student.objects.filter(pk__in=pks)._raw_delete(Student.objects.db)  # pylint: disable=protected-access
+            # Written last, so deleted_at stays close to the commit that a
+            # delta-sync cursor (DELTA_SYNC_SETTLE_SECONDS) waits for
+            deleted_at = timezone.now()
+            Tombstone.objects.bulk_create([
+                Tombstone(resource='students', object_id=pk, deleted_at=deleted_at) for pk in pks
+            ])
+            transaction.on_commit(partial(record_event, 'deleted', 'students', changes={
+                'archived': True,
+                'object_ids': pks,
+            }))
+        archived += len(pks)
+    if archived:
+        publish_change('students', 'bulk_deleted', None)
+    return archived
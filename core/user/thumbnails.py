@@ -0,0 +1,78 @@
+"""
+Avatar variant rendering, run in worker processes
+
+Kept free of Django imports so pool workers start quickly and never touch
+the database; everything they need is passed in as arguments.
+Pillow is imported on first use, so web processes that only schedule
+work do not load it.
+"""
+import os
+
+# File extension and Pillow format name of each variant format
+VARIANT_FORMATS = {
+    'webp': ('webp', 'WEBP'),
+    'jpeg': ('jpg', 'JPEG'),
+}
+
+
+# Pillow formats originals are re-encoded to, by the format Pillow reads
+# (MPO is the multi-picture flavour of JPEG)
+ORIGINAL_FORMATS = {'JPEG': 'JPEG', 'MPO': 'JPEG', 'PNG': 'PNG', 'GIF': 'GIF', 'WEBP': 'WEBP'}
+
+
+def variant_name(label, fmt):
+    return f'{label}.{VARIANT_FORMATS[fmt][0]}'
+
+
+def _save_atomic(image, path, pil_format, quality):
+    temporary = f'{path}.tmp{os.getpid()}'
+    image.save(temporary, pil_format, quality=quality)
+    os.replace(temporary, path)
+
+
+def render_variants(original_path, directory, sizes, formats, quality=80, max_pixels=40_000_000):
+    """
+    Write square, centre-cropped variants of an image into ``directory``
+    ``sizes`` maps labels to edge lengths in pixels, e.g. ``{'small': 48}``.
+    Returns the names of the files written.
+    """
+    from PIL import Image, ImageOps  # pylint: disable=import-outside-toplevel
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    written = []
+    with Image.open(original_path) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        for label, size in sizes.items():
+            variant = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            for fmt in formats:
+                _extension, pil_format = VARIANT_FORMATS[fmt]
+                output = variant
+                if pil_format == 'JPEG' and output.mode == 'RGBA':
+                    # JPEG has no alpha channel: flatten onto white
+                    output = Image.new('RGB', variant.size, (255, 255, 255))
+                    output.paste(variant, mask=variant.getchannel('A'))
+                name = variant_name(label, fmt)
+                _save_atomic(output, os.path.join(directory, name), pil_format, quality)
+                written.append(name)
+    return written
+
+
+def strip_metadata(path, quality=95, max_pixels=40_000_000):
+    """
+    Re-encode an uploaded image in place without its metadata (EXIF with
+    GPS position, XMP, comments, text chunks)
+    The EXIF orientation is applied to the pixels and animations keep only
+    their first frame, as in the variants.
+    """
+    from PIL import Image, ImageOps  # pylint: disable=import-outside-toplevel
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(path) as source:
+        pil_format = ORIGINAL_FORMATS.get(source.format)
+        if pil_format is None:
+            raise ValueError(f'Unsupported image format {source.format}')
+        image = ImageOps.exif_transpose(source)
+    # Keep only what is needed to draw the pixels
+    image.info = {key: value for key, value in image.info.items() if key == 'transparency'}
+    _save_atomic(image, path, pil_format, quality)
@@ -1,10 +1,19 @@
 from django.urls import path
-from . import views
+from . import views, avatar_views, summary_views, sync_views
 
 urlpatterns = [
     path('profile/', views.user_profile, name='user_profile'),
     path('demo/', views.simple_user_demo, name='simple_user_demo'),
     path('students/', views.students_list, name='students_list'),
+    path('students/analytics/', summary_views.students_analytics, name='students_analytics'),
+    path('students/<int:pk>/avatar/', avatar_views.avatar_upload, {'resource': 'students'}, name='student_avatar'),
+    path('students/changes/', sync_views.changes_feed, {'resource': 'students'}, name='students_changes'),
     path('parents/', views.parents_list, name='parents_list'),
+    path('parents/<int:parent_id>/children/', views.parent_children, name='parent_children'),
+    path('parents/<int:pk>/avatar/', avatar_views.avatar_upload, {'resource': 'parents'}, name='parent_avatar'),
+    path('parents/changes/', sync_views.changes_feed, {'resource': 'parents'}, name='parents_changes'),
     path('instructors/', views.instructors_list, name='instructors_list'),
+    path('instructors/<int:pk>/avatar/', avatar_views.avatar_upload, {'resource': 'instructors'}, name='instructor_avatar'),
+    path('instructors/changes/', sync_views.changes_feed, {'resource': 'instructors'}, name='instructors_changes'),
+    path('avatars/<str:digest>/<str:variant>/', avatar_views.avatar_file, name='avatar_file'),
 ]
@@ -1,8 +1,12 @@
 from django.contrib.auth import get_user_model  # pylint: disable=imported-auth-user
+from django.db.models import Count, F, Prefetch, prefetch_related_objects
+from django.urls import reverse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from .avatars import avatar_url
+from .listing import ListParamError, ListSpec, paginate, positive_int_param, wants_pagination
 from .models import UserProfile, Parent, Student, Instructor
 
 User = get_user_model()
@@ -72,64 +76,240 @@ def simple_user_demo(request):
     }, status=status.HTTP_200_OK)
 
 
+STUDENT_LIST = ListSpec(
+    fields={
+        'id': 'id',
+        'username': 'user__username',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'email': 'user__email',
+        'student_id': 'student_id',
+        'grade_level': 'grade_level',
+        'gpa': 'gpa',
+        'major': 'major',
+        'enrollment_date': 'enrollment_date',
+        'graduation_year': 'graduation_year',
+        'parent_id': 'parent_id',
+        'avatar_url': 'avatar_url',
+        'updated_at': 'updated_at',
+    },
+    default_fields=[
+        'id', 'username', 'first_name', 'last_name', 'email',
+        'student_id', 'grade_level', 'gpa', 'major', 'enrollment_date', 'avatar_url',
+    ],
+    filters={
+        'grade_level': 'grade_level',
+        'major': 'major',
+        'parent': 'parent_id',
+    },
+    sorts={
+        'id': 'id',
+        'student_id': 'student_id',
+        'grade_level': 'grade_level',
+    },
+    annotations={
+        'avatar_url': F('avatar_hash'),
+    },
+    formatters={
+        'gpa': lambda gpa: str(gpa) if gpa else None,
+        'avatar_url': avatar_url,
+    },
+)
+
+PARENT_LIST = ListSpec(
+    fields={
+        'id': 'id',
+        'username': 'user__username',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'email': 'user__email',
+        'phone_number': 'phone_number',
+        'occupation': 'occupation',
+        'address': 'address',
+        'children_count': 'children_count',
+        'avatar_url': 'avatar_url',
+        'updated_at': 'updated_at',
+    },
+    default_fields=[
+        'id', 'username', 'first_name', 'last_name', 'email',
+        'phone_number', 'occupation', 'address', 'children_count', 'avatar_url',
+    ],
+    filters={
+        'occupation': 'occupation',
+    },
+    sorts={
+        'id': 'id',
+    },
+    annotations={
+        'children_count': Count('children'),
+        'avatar_url': F('avatar_hash'),
+    },
+    formatters={
+        'avatar_url': avatar_url,
+    },
+)
+
+INSTRUCTOR_LIST = ListSpec(
+    fields={
+        'id': 'id',
+        'username': 'user__username',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'email': 'user__email',
+        'employee_id': 'employee_id',
+        'department': 'department',
+        'specialization': 'specialization',
+        'office_location': 'office_location',
+        'years_experience': 'years_experience',
+        'avatar_url': 'avatar_url',
+        'updated_at': 'updated_at',
+    },
+    default_fields=[
+        'id', 'username', 'first_name', 'last_name', 'email', 'employee_id',
+        'department', 'specialization', 'office_location', 'years_experience', 'avatar_url',
+    ],
+    filters={
+        'department': 'department',
+        'specialization': 'specialization',
+    },
+    sorts={
+        'id': 'id',
+        'employee_id': 'employee_id',
+        'department': 'department',
+    },
+    annotations={
+        'avatar_url': F('avatar_hash'),
+    },
+    formatters={
+        'avatar_url': avatar_url,
+    },
+)
+
+
+CHILDREN_DEFAULT_LIMIT = 10
+CHILDREN_MAX_LIMIT = 50
+CHILD_FIELDS = ('id', 'parent_id', 'student_id', 'grade_level', 'gpa', 'avatar_hash', 'user__username', 'user__first_name', 'user__last_name')
+
+
+def _child_data(student):
+    """Render a prefetched child (see CHILD_FIELDS) for an expanded parent"""
+    return {
+        'id': student.id,
+        'user': {
+            'username': student.user.username,
+            'first_name': student.user.first_name,
+            'last_name': student.user.last_name,
+        },
+        'student_id': student.student_id,
+        'grade_level': student.grade_level,
+        'gpa': str(student.gpa) if student.gpa else None,
+        'avatar_url': avatar_url(student.avatar_hash),
+    }
+
+
+def _expand_children(data, limit):
+    """
+    Attach the first ``limit`` children to each rendered parent
+    Uses one windowed prefetch query for the whole page of parents
+    """
+    parents = [Parent(pk=item['id']) for item in data]
+    children = (
+        Student.objects
+        .select_related('user')
+        .only(*CHILD_FIELDS)
+        .order_by('student_id')
+    )
+    prefetch_related_objects(parents, Prefetch('children', queryset=children[:limit], to_attr='children_page'))
+    for item, parent in zip(data, parents):
+        item['children'] = [_child_data(child) for child in parent.children_page]
+        item['children_url'] = reverse('parent_children', args=[parent.pk])
+
+
+def _list_response(request, spec, queryset, key, expand=None):
+    """
+    Render a list endpoint honouring ?fields=, ?filter[...]=, ?sort= and ?page=
+    """
+    params = request.query_params
+    try:
+        rows, names = spec.apply(queryset, params)
+        pagination = None
+        if expand or wants_pagination(params):
+            rows, pagination = paginate(rows, params)
+        if expand:
+            children_limit = positive_int_param(params, 'children_limit', CHILDREN_DEFAULT_LIMIT, CHILDREN_MAX_LIMIT)
+    except ListParamError as exc:
+        return Response({
+            'error': str(exc)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    data = spec.render(rows, names)
+    if expand:
+        expand(data, children_limit)
+
+    payload = {
+        key: data,
+        'count': len(data)
+    }
+    if pagination:
+        payload['pagination'] = pagination
+    return Response(payload, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def students_list(request):
     """
-    Get list of all students
+    Get list of students
+    Supports ?fields=, ?filter[grade_level|major|parent]= and ?sort=
     """
-    students = Student.objects.all()
-    students_data = []
-    
-    for student in students:
-        students_data.append({
-            'id': student.id,
-            'user': {
-                'username': student.user.username,
-                'first_name': student.user.first_name,
-                'last_name': student.user.last_name,
-                'email': student.user.email,
-            },
-            'student_id': student.student_id,
-            'grade_level': student.grade_level,
-            'gpa': str(student.gpa) if student.gpa else None,
-            'major': student.major,
-            'enrollment_date': student.enrollment_date,
-        })
-    
-    return Response({
-        'students': students_data,
-        'count': len(students_data)
-    }, status=status.HTTP_200_OK)
+    return _list_response(request, STUDENT_LIST, Student.objects.all(), 'students')
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def parents_list(request):
     """
-    Get list of all parents
+    Get list of parents
+    Supports ?fields=, ?filter[occupation]=, ?sort= and ?expand=children
+    (expanded lists are paginated, with at most ?children_limit= children per parent)
     """
-    parents = Parent.objects.all()
-    parents_data = []
-    
-    for parent in parents:
-        parents_data.append({
-            'id': parent.id,
-            'user': {
-                'username': parent.user.username,
-                'first_name': parent.user.first_name,
-                'last_name': parent.user.last_name,
-                'email': parent.user.email,
-            },
-            'phone_number': parent.phone_number,
-            'occupation': parent.occupation,
-            'address': parent.address,
-            'children_count': parent.children.count() if hasattr(parent, 'children') else 0,
-        })
-    
+    expand = None
+    if request.query_params.get('expand'):
+        if request.query_params['expand'] != 'children':
+            return Response({
+                'error': 'Only expand=children is supported'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        expand = _expand_children
+    return _list_response(request, PARENT_LIST, Parent.objects.all(), 'parents', expand=expand)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def parent_children(request, parent_id):
+    """
+    Get a page of a parent's children
+    Supports the same ?fields=, ?filter[...]= and ?sort= as the students list
+    """
+    if not Parent.objects.filter(pk=parent_id).exists():
+        return Response({
+            'error': 'Parent not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    children = Student.objects.filter(parent_id=parent_id)
+    try:
+        rows, names = STUDENT_LIST.apply(children, request.query_params)
+        rows, pagination = paginate(rows, request.query_params)
+    except ListParamError as exc:
+        return Response({
+            'error': str(exc)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    data = STUDENT_LIST.render(rows, names)
     return Response({
-        'parents': parents_data,
-        'count': len(parents_data)
+        'parent_id': parent_id,
+        'children': data,
+        'count': len(data),
+        'pagination': pagination
     }, status=status.HTTP_200_OK)
 
 
@@ -137,28 +317,7 @@ def parents_list(request):
 @permission_classes([IsAuthenticated])
 def instructors_list(request):
     """
-    Get list of all instructors
+    Get list of instructors
+    Supports ?fields=, ?filter[department|specialization]= and ?sort=
     """
-    instructors = Instructor.objects.all()
-    instructors_data = []
-    
-    for instructor in instructors:
-        instructors_data.append({
-            'id': instructor.id,
-            'user': {
-                'username': instructor.user.username,
-                'first_name': instructor.user.first_name,
-                'last_name': instructor.user.last_name,
-                'email': instructor.user.email,
-            },
-            'employee_id': instructor.employee_id,
-            'department': instructor.department,
-            'specialization': instructor.specialization,
-            'office_location': instructor.office_location,
-            'years_experience': instructor.years_experience,
-        })
-    
-    return Response({
-        'instructors': instructors_data,
-        'count': len(instructors_data)
-    }, status=status.HTTP_200_OK)
+    return _list_response(request, INSTRUCTOR_LIST, Instructor.objects.all(), 'instructors')
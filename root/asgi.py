@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'root.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up; serves the change event stream
+# (Server-Sent Events / WebSocket) and delegates everything else to Django
+from core.user.events.asgi import EventStreamRouter  # noqa: E402  pylint: disable=wrong-import-position
+
+application = EventStreamRouter(django_application)
@@ -0,0 +1,214 @@
+import copy
+import io
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+logger = logging.getLogger(__name__)
+
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+SAFE_METHODS = ('GET',)
+
+
+class BatchPart:
+    """A single sub-request of a batch"""
+
+    def __init__(self, index, spec):
+        self.id = spec.get('id', index)
+        self.method = str(spec.get('method', 'GET')).upper()
+        self.path = spec.get('path')
+        self.body = spec.get('body')
+        self.match = None
+
+    def validate(self):
+        """Return ``(status, body)`` for an invalid part, or None when it can be dispatched"""
+        if self.method not in BATCH_METHODS:
+            return status.HTTP_400_BAD_REQUEST, {'error': f'Method "{self.method}" is not allowed'}
+        if not isinstance(self.path, str) or not self.path.startswith(settings.API_PATH_PREFIX):
+            return status.HTTP_400_BAD_REQUEST, {'error': f'Path must start with {settings.API_PATH_PREFIX}'}
+        try:
+            self.match = resolve(urlsplit(self.path).path)
+        except Resolver404:
+            return status.HTTP_404_NOT_FOUND, {'error': 'Not found'}
+        if self.match.func is batch:
+            return status.HTTP_400_BAD_REQUEST, {'error': 'Batches cannot be nested'}
+        return None
+
+
+def _build_subrequest(request, part):
+    """
+    Clone the already-authenticated request for a sub-request
+    The user and session objects are shared, so they are loaded only once
+    """
+    url = urlsplit(part.path)
+    body = json.dumps(part.body).encode() if part.body is not None else b''
+
+    sub = copy.copy(request)
+    for attr in ('_post', '_files', '_stream', '_body'):
+        sub.__dict__.pop(attr, None)
+    sub.method = part.method
+    sub.path = sub.path_info = url.path
+    sub.GET = QueryDict(url.query)
+    sub.META = {
+        **request.META,
+        'REQUEST_METHOD': part.method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+    }
+    sub._body = body  # pylint: disable=protected-access
+    sub._stream = io.BytesIO(body)  # pylint: disable=protected-access
+    sub._read_started = False  # pylint: disable=protected-access
+    sub.resolver_match = part.match
+    return sub
+
+
+def _dispatch(request, part):
+    """
+    Run one sub-request and return its status and body
+    Each part is admitted in its own route class (core/middleware/admission.py),
+    so a batch cannot get around the read and write concurrency limits.
+    """
+    sub = _build_subrequest(request, part)
+    admission = getattr(request, 'admission', None)
+    with admission.admit(sub) if admission is not None else nullcontext() as shed:
+        if shed is not None:
+            return shed.status_code, json.loads(shed.content)
+        try:
+            response = part.match.func(sub, *part.match.args, **part.match.kwargs)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Batch part %s %s failed', part.method, part.path)
+            return status.HTTP_500_INTERNAL_SERVER_ERROR, {'error': 'Internal server error'}
+
+    if hasattr(response, 'data'):
+        return response.status_code, response.data
+    content = b'' if response.streaming else response.content
+    try:
+        return response.status_code, json.loads(content) if content else None
+    except ValueError:
+        return response.status_code, content.decode(response.charset, errors='replace')
+
+
+def _dispatch_in_thread(request, part):
+    """
+    Dispatch from a pool thread
+    Pool threads are long-lived, so their DB connections are kept and
+    recycled like a request's (CONN_MAX_AGE, health checks) rather than
+    opened and closed for every part.
+    """
+    close_old_connections()
+    try:
+        return _dispatch(request, part)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix='batch')
+        return _executor
+
+
+def _run_parts(request, parts):
+    """
+    Run sub-requests, concurrently for runs of at least BATCH_PARALLEL_MIN_READS
+    consecutive safe (GET) requests; shorter runs use the request's own
+    connection. Writes act as barriers so they keep their order relative to reads
+    """
+    results = {}
+    pending_reads = []
+
+    def flush_reads():
+        if len(pending_reads) < settings.BATCH_PARALLEL_MIN_READS:
+            for part in pending_reads:
+                results[part] = _dispatch(request, part)
+        else:
+            executor = _get_executor()
+            futures = {part: executor.submit(_dispatch_in_thread, request, part) for part in pending_reads}
+            for part, future in futures.items():
+                results[part] = future.result()
+        pending_reads.clear()
+
+    for part in parts:
+        if part.method in SAFE_METHODS:
+            pending_reads.append(part)
+            continue
+        flush_reads()
+        results[part] = _dispatch(request, part)
+    flush_reads()
+    return results
+
+
+def _reset_after_fork():
+    # The parent's pool threads do not exist in a forked worker
+    global _executor, _executor_lock  # pylint: disable=global-statement
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several API requests under one authentication and session load
+    Body: {"requests": [{"id": "profile", "method": "GET", "path": "/api/user/profile/"}, ...]}
+    """
+    specs = request.data.get('requests') if isinstance(request.data, dict) else None
+
+    if not isinstance(specs, list) or not specs:
+        return Response({
+            'error': 'requests must be a non-empty list'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(specs) > settings.BATCH_MAX_REQUESTS:
+        return Response({
+            'error': f'A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if not all(isinstance(spec, dict) for spec in specs):
+        return Response({
+            'error': 'Each request must be an object'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    parts = [BatchPart(index, spec) for index, spec in enumerate(specs)]
+    results = {part: part.validate() for part in parts}
+    runnable = [part for part in parts if results[part] is None]
+    results.update(_run_parts(request._request, runnable))  # pylint: disable=protected-access
+
+    responses = []
+    for part in parts:
+        code, body = results[part]
+        responses.append({
+            'id': part.id,
+            'status': code,
+            'body': body,
+        })
+
+    return Response({
+        'responses': responses,
+        'count': len(responses)
+    }, status=status.HTTP_200_OK)
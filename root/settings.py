@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,19 +43,34 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'core.auth.apps.AuthConfig',
     'core.user',
+    'core.profiling.apps.ProfilingConfig',
+    'core.audit.apps.AuditConfig',
 ]
 
+# Common, Messages and XFrameOptions are path-scoped: requests under
+# API_PATH_PREFIX skip them (see core/middleware/fastpath.py).
+# CORS preflight requests are answered by CorsMiddleware before anything else runs.
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.admission.AdmissionControlMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
+    'core.middleware.fastpath.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.audit.middleware.AuditContextMiddleware',
+    'core.profiling.middleware.ProfilingMiddleware',
+    'core.middleware.fastpath.MessageMiddleware',
+    'core.middleware.fastpath.XFrameOptionsMiddleware',
 ]
 
+# Requests under this prefix take the API middleware fast path
+API_PATH_PREFIX = '/api/'
+
+# HTML pages under API_PATH_PREFIX that keep the full browser middleware stack
+API_HTML_PATHS = ['/api/docs/', '/api/redoc/']
+
 ROOT_URLCONF = 'root.urls'
 
 TEMPLATES = [
@@ -82,6 +98,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections between requests (and in batch pool threads)
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -156,6 +175,9 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Let browsers cache preflight responses for a day
+CORS_PREFLIGHT_MAX_AGE = 60 * 60 * 24
+
 # Allow all origins for development (more permissive)
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development!
 
@@ -179,3 +201,119 @@ SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 
 # Cache time to live is 300 seconds (5 minutes)
 CACHE_TTL = 60 * 5
+
+# Response compression for API_PATH_PREFIX (core/middleware/compression.py).
+# brotli and zstd are used when the optional brotli/zstandard packages are installed
+API_COMPRESSION = {
+    'ENCODINGS': ['br', 'zstd', 'gzip'],  # server preference order
+    'MIN_SIZE': 1024,  # smaller bodies are sent uncompressed
+    'CACHE_MIN_SIZE': 16 * 1024,  # compressed bodies this large are cached by content digest
+    'CACHE_ALIAS': 'default',
+}
+
+# Admission control for API_PATH_PREFIX (core/middleware/admission.py).
+# Each route class admits up to its (adaptive) limit of concurrent requests;
+# others queue for at most QUEUE_TIMEOUT_MS and are then shed with a 503
+ADMISSION_CONTROL = {
+    'ENABLED': True,
+    'AUTH_PATH_PREFIX': '/api/auth/',  # 'auth' class; other requests are 'read' (safe methods) or 'write'
+    'EXEMPT_PATHS': ['/api/metrics/'],
+    'BATCH_PATHS': ['/api/batch/'],  # admitted per sub-request (root/batch.py), not as a whole
+    'MAX_QUEUE_MS': 2000,  # total queue budget, including upstream time from X-Request-Start
+    'RETRY_AFTER': 1,  # seconds
+    'CLASSES': {
+        # Password hashing is CPU-bound: keep few signins in flight per worker
+        'auth': {'INITIAL_LIMIT': 2, 'MIN_LIMIT': 1, 'MAX_LIMIT': 4,
+                 'TARGET_LATENCY_MS': 500, 'QUEUE_TIMEOUT_MS': 1000, 'MAX_QUEUE': 8},
+        'read': {'INITIAL_LIMIT': 8, 'MIN_LIMIT': 2, 'MAX_LIMIT': 32,
+                 'TARGET_LATENCY_MS': 250, 'QUEUE_TIMEOUT_MS': 500, 'MAX_QUEUE': 32},
+        'write': {'INITIAL_LIMIT': 4, 'MIN_LIMIT': 1, 'MAX_LIMIT': 16,
+                  'TARGET_LATENCY_MS': 500, 'QUEUE_TIMEOUT_MS': 1000, 'MAX_QUEUE': 16},
+    },
+}
+
+# Audit log of role changes and auth events (core/audit). Events are buffered
+# in memory and written in batches by a background thread
+AUDIT_LOG = {
+    'ENABLED': True,
+    'BUFFER_SIZE': 10000,  # events beyond this are dropped and counted
+    'BATCH_SIZE': 500,  # rows per bulk INSERT
+    'FLUSH_INTERVAL': 1.0,  # seconds
+}
+
+# Uploaded files
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Avatar uploads (core/user/avatars.py). Originals are stored by content
+# hash; square variants are rendered in a process pool (needs Pillow)
+AVATARS = {
+    'DIRECTORY': MEDIA_ROOT / 'avatars',
+    'MAX_UPLOAD_SIZE': 5 * 1024 * 1024,
+    'SIZES': {'small': 48, 'medium': 160},  # edge length in pixels
+    'FORMATS': ['webp', 'jpeg'],  # served in this order of preference
+    'QUALITY': 80,
+    'WORKERS': 2,  # thumbnailing processes per web worker
+    'CACHE_MAX_AGE': 60 * 60 * 24 * 365,  # hashed URLs never change
+}
+
+# On-demand request profiling (core/profiling). Captures are listed at /admin/profiles/
+PROFILING = {
+    'ENABLED': False,  # when False the middleware is removed at startup
+    'HEADER': 'X-Profile',  # profile requests carrying this header from staff users...
+    'TOKEN': '',  # ...or whose header value matches this shared token
+    'SAMPLE_RATE': 0.0,  # fraction of all requests to profile
+    'SLOW_REQUEST_MS': None,  # also keep SQL captures of requests slower than this
+    'SLOW_QUERY_MS': 100,  # attach EXPLAIN output to queries slower than this
+    # Never store parameters of writes to these tables or of queries naming these columns
+    'REDACT_COLUMNS': {'auth_user': ['password'], 'django_session': ['session_key', 'session_data']},
+    'DIRECTORY': BASE_DIR / 'profiles',
+    'MAX_PROFILES': 50,
+}
+
+# Term-end bulk operations (manage.py term_end, Student admin actions)
+# Maps each grade_level to the next one; grades not listed are never promoted
+GRADE_PROGRESSION = {'K': '1', **{str(grade): str(grade + 1) for grade in range(1, 12)}}
+TERM_END_CHUNK_SIZE = 1000
+
+# Public id formats for students and instructors (core/user/id_allocator.py)
+ID_SEQUENCES = {
+    'student_id': {'PREFIX': 'STU', 'WIDTH': 6},
+    'employee_id': {'PREFIX': 'EMP', 'WIDTH': 5},
+}
+# Ids reserved per database round-trip by each worker
+ID_BLOCK_SIZE = 50
+
+# Batch endpoint (/api/batch/) limits
+BATCH_MAX_REQUESTS = 10
+BATCH_MAX_WORKERS = 4
+# Runs of fewer consecutive GET parts than this are run one after another on
+# the request's own DB connection; a thread (and its connection) costs more
+BATCH_PARALLEL_MIN_READS = 4
+
+# Delta-sync change feeds (/api/user/<resource>/changes/)
+DELTA_SYNC_PAGE_SIZE = 500
+# Rows updated within this many seconds are held back until the next poll,
+# so transactions that commit late cannot slip behind a cursor
+DELTA_SYNC_SETTLE_SECONDS = 2
+# Deletion tombstones older than this are pruned (manage.py prune_tombstones);
+# cursors older than this must perform a full sync
+DELTA_SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Change event push channel, served by root/asgi.py (SSE or WebSocket)
+EVENT_STREAM_PATH = '/api/user/events/'
+# Broker class. With several nodes use 'core.user.events.broker.RedisBroker'
+# (needs the optional redis package) so every node sees every change
+EVENT_BROKER = 'core.user.events.broker.InMemoryBroker'
+EVENT_BROKER_URL = 'redis://localhost:6379/0'
+EVENT_BROKER_CHANNEL = 'user:events'
+# Cross-origin pages allowed to open the stream (same-origin is always allowed).
+# CORS_ALLOW_ALL_ORIGINS does not apply: the stream uses the session cookie
+EVENT_STREAM_ALLOWED_ORIGINS = list(CORS_ALLOWED_ORIGINS)
+# Resources non-staff users may subscribe to (staff receive all)
+EVENT_STREAM_RESOURCES = ['students', 'parents', 'instructors']
+# Events buffered per connection before a slow client is told to resync
+EVENT_STREAM_QUEUE_SIZE = 100
+# Seconds between keepalives on idle connections
+EVENT_STREAM_HEARTBEAT = 15
+# Seconds between session re-validations of an open connection
+EVENT_STREAM_SESSION_RECHECK = 60
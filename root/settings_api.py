@@ -0,0 +1,55 @@
+"""
+Lean settings for API-only workers
+
+Serves only /api/auth/ and /api/user/ (see root/urls_api.py) and leaves
+out the admin, messages, staticfiles, templates, API docs and profiling
+apps, so workers import less and start faster. Use with root/wsgi_api.py:
+
+    DJANGO_SETTINGS_MODULE=root.settings_api gunicorn --preload root.wsgi_api
+
+Admin, docs and migrations keep using root.settings.
+"""
+from .settings import *  # noqa: F401,F403  pylint: disable=wildcard-import,unused-wildcard-import
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'rest_framework',
+    'corsheaders',
+    'core.auth.apps.AuthConfig',
+    'core.user',
+    'core.audit.apps.AuditConfig',
+]
+
+# Every route is an API route, so the browser-only middleware is dropped
+# rather than skipped per request
+MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.admission.AdmissionControlMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.audit.middleware.AuditContextMiddleware',
+]
+
+ROOT_URLCONF = 'root.urls_api'
+
+WSGI_APPLICATION = 'root.wsgi_api.application'
+
+# JSON only: no template engine is needed
+TEMPLATES = []
+
+API_HTML_PATHS = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema',
+}
+
+# Extra modules imported by root.warmup before workers fork, so they are
+# shared copy-on-write instead of being imported by each worker on first
+# use (e.g. 'numpy' for /api/user/students/analytics/)
+PRELOAD_MODULES = []
@@ -15,15 +15,23 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
+from django.views.decorators.cache import cache_page
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from root import views
+from root.batch import batch
 
 urlpatterns = [
+    path('admin/profiles/', include('core.profiling.urls')),
     path('admin/', admin.site.urls),
     path('api/auth/', include('core.auth.urls')),
     path('api/user/', include('core.user.urls')),
+    path('api/audit/', include('core.audit.urls')),
+    path('api/batch/', batch, name='batch'),
+    path('api/metrics/', views.metrics, name='metrics'),
     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', cache_page(settings.CACHE_TTL)(SpectacularAPIView.as_view()), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
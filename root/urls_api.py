@@ -0,0 +1,11 @@
+"""
+URL configuration for API-only workers (root.settings_api)
+"""
+from django.urls import path, include
+from root.batch import batch
+
+urlpatterns = [
+    path('api/auth/', include('core.auth.urls')),
+    path('api/user/', include('core.user.urls')),
+    path('api/batch/', batch, name='batch'),
+]
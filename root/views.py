@@ -1,5 +1,19 @@
 from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+from core.middleware.metrics import metrics as api_metrics
 
 
 def home(request):
     return HttpResponse("Root app home page")
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """
+    Get this worker's API middleware metrics (compression, admission control, ...)
+    """
+    return Response(api_metrics.snapshot(), status=status.HTTP_200_OK)
@@ -0,0 +1,39 @@
+"""
+Warm up a Django process before it forks into workers
+
+Loading the URLconf (and with it every view module), the DRF policy
+classes and the password hasher up front means the first request of each
+worker does not pay for them, and with ``gunicorn --preload`` the imported
+code is shared between workers copy-on-write. Database connections are
+closed so no socket is shared across the fork.
+"""
+import gc
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.db import connections
+from django.urls import get_resolver
+from rest_framework.settings import api_settings
+
+DRF_POLICIES = (
+    'DEFAULT_RENDERER_CLASSES',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+)
+
+
+def warm_up():
+    """Import everything the first requests would, then freeze the heap"""
+    get_resolver()._populate()  # pylint: disable=protected-access
+    for name in DRF_POLICIES:
+        getattr(api_settings, name)
+    get_hasher()
+    for module in getattr(settings, 'PRELOAD_MODULES', ()):
+        import_module(module)
+    connections.close_all()
+    # Keep the collector from touching (and so copying) the preloaded
+    # objects in every worker
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,19 @@
+"""
+WSGI config for API-only workers
+
+Uses the lean root.settings_api profile and warms the process up at import
+time, so ``gunicorn --preload root.wsgi_api`` does the work once in the
+master before forking.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'root.settings_api')
+
+application = get_wsgi_application()
+
+from root.warmup import warm_up  # noqa: E402  pylint: disable=wrong-import-position
+
+warm_up()